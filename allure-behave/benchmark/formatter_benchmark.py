@@ -0,0 +1,66 @@
+"""
+Runs generated features with 1000 scenarios of 5 steps each with and without
+the Allure formatter and prints the per-scenario overhead.
+
+    $ python benchmark/formatter_benchmark.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from allure_commons_test.benchmark import main
+
+SCENARIOS = 1000
+STEPS = 5
+FEATURES = 10
+
+
+def generate_features(directory):
+    steps = os.path.join(directory, 'steps')
+    os.makedirs(steps)
+    with open(os.path.join(steps, 'steps.py'), 'w') as steps_file:
+        steps_file.write('from behave import step\n\n\n'
+                         '@step("step {index:d}")\n'
+                         'def step_impl(context, index):\n'
+                         '    pass\n')
+
+    for feature in range(FEATURES):
+        path = os.path.join(directory, 'feature_{feature}.feature'.format(feature=feature))
+        with open(path, 'w') as feature_file:
+            feature_file.write('Feature: Feature {feature}\n\n'.format(feature=feature))
+            for scenario in range(SCENARIOS // FEATURES):
+                feature_file.write('  Scenario: Scenario {scenario}\n'.format(scenario=scenario))
+                for index in range(STEPS):
+                    keyword = 'Given' if not index else 'And'
+                    feature_file.write('    {keyword} step {index}\n'.format(keyword=keyword, index=index))
+                feature_file.write('\n')
+
+
+def run_behave(features, *args):
+    command = [sys.executable, '-m', 'behave', '--no-capture'] + list(args or ('--format', 'null')) + [features]
+    with open(os.devnull, 'w') as devnull:
+        subprocess.check_call(command, stdout=devnull)
+
+
+def benchmarks(directory):
+    features = os.path.join(directory, 'features')
+    generate_features(features)
+    results = os.path.join(directory, 'allure-results')
+
+    yield 'without formatter', lambda: run_behave(features)
+    yield 'with formatter', lambda: run_behave(features, '--format', 'allure_behave.formatter:AllureFormatter',
+                                               '--outfile', results)
+
+
+if __name__ == '__main__':
+    directory = tempfile.mkdtemp()
+    try:
+        results = main(benchmarks(directory), __file__, repeat=3, number=1)
+    finally:
+        shutil.rmtree(directory)
+    if 'without formatter' in results and 'with formatter' in results:
+        overhead = (results['with formatter'] - results['without formatter']) / SCENARIOS
+        print('overhead per scenario: {time:.1f} us'.format(time=overhead * 1e6))
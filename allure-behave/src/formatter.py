@@ -3,7 +3,7 @@ from behave.formatter.base import Formatter
 import allure_commons
 from allure_commons.logger import AllureFileLogger
 from allure_behave.listener import AllureListener
-from allure_commons.utils import get_testplan
+from allure_commons.testplan import load_testplan
 from allure_behave.utils import is_planned_scenario
 
 
@@ -12,12 +12,13 @@ class AllureFormatter(Formatter):
         super(AllureFormatter, self).__init__(stream_opener, config)
 
         self.listener = AllureListener(config)
-        file_logger = AllureFileLogger(self.stream_opener.name)
+        json_backend = config.userdata.get('AllureFormatter.json_backend', None)
+        self.file_logger = AllureFileLogger(self.stream_opener.name, json_backend=json_backend)
 
         allure_commons.plugin_manager.register(self.listener)
-        allure_commons.plugin_manager.register(file_logger)
+        allure_commons.plugin_manager.register(self.file_logger)
 
-        self.testplan = get_testplan()
+        self.testplan = load_testplan()
 
     def _wrap_scenario(self, scenarios):
         for scenario in scenarios:
@@ -42,3 +43,7 @@ class AllureFormatter(Formatter):
 
     def eof(self):
         self.listener.stop_feature()
+
+    def close(self):
+        self.file_logger.close()
+        super(AllureFormatter, self).close()
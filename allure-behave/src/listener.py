@@ -3,9 +3,9 @@
 from collections import deque
 import allure_commons
 from allure_commons.reporter import AllureReporter
-from allure_commons.utils import uuid4
+from allure_commons.utils import uuid4, fast_uuid
 from allure_commons.utils import now
-from allure_commons.utils import platform_label
+from allure_commons.utils import session_labels
 from allure_commons.types import LabelType, AttachmentType
 from allure_commons.model2 import TestResult
 from allure_commons.model2 import TestStepResult
@@ -39,6 +39,7 @@ class AllureListener(object):
         self.execution_context = Context()
         self.fixture_context = Context()
         self.steps = deque()
+        self._session_labels = session_labels('behave', host=False, thread=False)
 
     def __del__(self):
         for group in self.fixture_context.exit():
@@ -105,8 +106,7 @@ class AllureListener(object):
         test_case.links.extend(scenario_links(scenario, issue_pattern=issue_pattern, link_pattern=link_pattern))
         test_case.labels.extend(scenario_labels(scenario))
         test_case.labels.append(Label(name=LabelType.FEATURE, value=scenario.feature.name))
-        test_case.labels.append(Label(name=LabelType.FRAMEWORK, value='behave'))
-        test_case.labels.append(Label(name=LabelType.LANGUAGE, value=platform_label()))
+        test_case.labels.extend(self._session_labels)
 
         self.logger.schedule_test(self.current_scenario_uuid, test_case)
 
@@ -147,17 +147,17 @@ class AllureListener(object):
 
     def start_behave_step(self, step):
 
-        self.current_step_uuid = uuid4()
+        self.current_step_uuid = fast_uuid()
         name = u'{keyword} {title}'.format(keyword=step.keyword, title=step.name)
 
         allure_step = TestStepResult(name=name, start=now())
         self.logger.start_step(None, self.current_step_uuid, allure_step)
 
         if step.text:
-            self.logger.attach_data(uuid4(), step.text, name='.text', attachment_type=AttachmentType.TEXT)
+            self.logger.attach_data(fast_uuid(), step.text, name='.text', attachment_type=AttachmentType.TEXT)
 
         if step.table:
-            self.logger.attach_data(uuid4(), step_table(step), name='.table', attachment_type=AttachmentType.CSV)
+            self.logger.attach_data(fast_uuid(), step_table(step), name='.table', attachment_type=AttachmentType.CSV)
 
     def stop_behave_step(self, result):
         status = step_status(result)
@@ -185,11 +185,11 @@ class AllureListener(object):
 
     @allure_commons.hookimpl
     def attach_data(self, body, name, attachment_type, extension):
-        self.logger.attach_data(uuid4(), body, name=name, attachment_type=attachment_type, extension=extension)
+        self.logger.attach_data(fast_uuid(), body, name=name, attachment_type=attachment_type, extension=extension)
 
     @allure_commons.hookimpl
     def attach_file(self, source, name, attachment_type, extension):
-        self.logger.attach_file(uuid4(), source, name=name, attachment_type=attachment_type, extension=extension)
+        self.logger.attach_file(fast_uuid(), source, name=name, attachment_type=attachment_type, extension=extension)
 
 
 class Context(list):
@@ -123,7 +123,6 @@ def is_planned_scenario(scenario, test_plan):
         labels = scenario_labels(scenario)
         id_labels = list(filter(lambda label: label.name == LabelType.ID, labels))
         allure_id = id_labels[0].value if id_labels else None
-        for item in test_plan:
-            if (allure_id and allure_id == item.get("id")) or fullname == item.get("selector"):
-                return
+        if test_plan.contains_id(allure_id) or test_plan.contains_selector(fullname):
+            return
         scenario.skip(reason=TEST_PLAN_SKIP_REASON)
@@ -6,11 +6,9 @@ from allure_commons.lifecycle import AllureLifecycle
 from nose2 import result
 from allure_commons.model2 import Status
 from allure_commons.model2 import StatusDetails
-from allure_commons.model2 import Label
-from allure_commons.types import LabelType
-from allure_commons.utils import host_tag, thread_tag
+from allure_commons.utils import session_labels
 
-from allure_commons.utils import platform_label, md5
+from allure_commons.utils import md5
 
 
 from .utils import timestamp_millis, status_details, update_attrs, labels, name, fullname, params
@@ -48,8 +46,7 @@ class Allure(Plugin):
 
     def __init__(self, *args, **kwargs):
         super(Allure, self).__init__(*args, **kwargs)
-        self._host = host_tag()
-        self._thread = thread_tag()
+        self._session_labels = session_labels('nose2')
         self.lifecycle = AllureLifecycle()
         self.logger = AllureFileLogger("allure-result")
         self.listener = AllureListener(self.lifecycle)
@@ -63,6 +60,7 @@ class Allure(Plugin):
 
     def stopSubprocess(self, event):
         self.unregister_allure_plugins()
+        self.logger.close()
 
     def register_allure_plugins(self):
         plugin_manager.register(self.listener)
@@ -81,6 +79,7 @@ class Allure(Plugin):
 
     def afterTestRun(self, event):
         self.unregister_allure_plugins()
+        self.logger.close()
 
     def startTest(self, event):
         if self.is_registered():
@@ -91,10 +90,7 @@ class Allure(Plugin):
                 test_result.testCaseId = md5(test_result.fullName)
                 test_result.historyId = md5(event.test.id())
                 test_result.labels.extend(labels(event.test))
-                test_result.labels.append(Label(name=LabelType.HOST, value=self._host))
-                test_result.labels.append(Label(name=LabelType.THREAD, value=self._thread))
-                test_result.labels.append(Label(name=LabelType.FRAMEWORK, value='nose2'))
-                test_result.labels.append(Label(name=LabelType.LANGUAGE, value=platform_label()))
+                test_result.labels.extend(self._session_labels)
                 test_result.parameters = params(event)
 
     def stopTest(self, event):
@@ -39,4 +39,5 @@ def pytest_configure(config):
 
         file_logger = AllureFileLogger(report_dir, clean)
         allure_commons.plugin_manager.register(file_logger)
+        config.add_cleanup(file_logger.close)
         config.add_cleanup(cleanup_factory(file_logger))
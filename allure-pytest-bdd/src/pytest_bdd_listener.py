@@ -1,13 +1,12 @@
 import pytest
 import allure_commons
 from allure_commons.utils import now
-from allure_commons.utils import uuid4
+from allure_commons.utils import fast_uuid
 from allure_commons.model2 import Label
 from allure_commons.model2 import Status
 
 from allure_commons.types import LabelType
-from allure_commons.utils import platform_label
-from allure_commons.utils import host_tag, thread_tag
+from allure_commons.utils import session_labels
 from .utils import get_uuid
 from .utils import get_step_name
 from .utils import get_status_details
@@ -21,8 +20,7 @@ from .utils import get_full_name, get_name, get_params
 class PytestBDDListener(object):
     def __init__(self):
         self.lifecycle = AllureLifecycle()
-        self.host = host_tag()
-        self.thread = thread_tag()
+        self.session_labels = session_labels('pytest-bdd')
 
     def _scenario_finalizer(self, scenario):
         for step in scenario.steps:
@@ -41,10 +39,7 @@ class PytestBDDListener(object):
             test_result.fullName = full_name
             test_result.name = name
             test_result.start = now()
-            test_result.labels.append(Label(name=LabelType.HOST, value=self.host))
-            test_result.labels.append(Label(name=LabelType.THREAD, value=self.thread))
-            test_result.labels.append(Label(name=LabelType.FRAMEWORK, value="pytest-bdd"))
-            test_result.labels.append(Label(name=LabelType.LANGUAGE, value=platform_label()))
+            test_result.labels.extend(self.session_labels)
             test_result.labels.append(Label(name=LabelType.FEATURE, value=feature.name))
             test_result.parameters = get_params(request.node)
 
@@ -118,8 +113,8 @@ class PytestBDDListener(object):
 
     @allure_commons.hookimpl
     def attach_data(self, body, name, attachment_type, extension):
-        self.lifecycle.attach_data(uuid4(), body, name=name, attachment_type=attachment_type, extension=extension)
+        self.lifecycle.attach_data(fast_uuid(), body, name=name, attachment_type=attachment_type, extension=extension)
 
     @allure_commons.hookimpl
     def attach_file(self, source, name, attachment_type, extension):
-        self.lifecycle.attach_file(uuid4(), source, name=name, attachment_type=attachment_type, extension=extension)
+        self.lifecycle.attach_file(fast_uuid(), source, name=name, attachment_type=attachment_type, extension=extension)
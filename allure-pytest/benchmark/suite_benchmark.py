@@ -0,0 +1,94 @@
+"""
+Runs a generated suite of 10k trivial tests without allure-pytest, with the
+plugin loaded but no --alluredir and with results written to a directory,
+and prints the per-test overhead of Allure. The same suite with Allure labels,
+links and pytest markers on every test runs with --alluredir as well, and so
+does a suite where every test uses 30 session fixtures.
+
+    $ python benchmark/suite_benchmark.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from allure_commons_test.benchmark import main
+
+TESTS = 10000
+MODULES = 10
+FIXTURES = 30
+
+
+MARKERS = ('@allure.id("{index}")\n'
+           '@allure.feature("feature {module}")\n'
+           '@allure.story("story {index}")\n'
+           '@allure.tag("tag")\n'
+           '@allure.link("https://example.org/{index}", name="link")\n'
+           '@pytest.mark.slow\n'
+           '@pytest.mark.skipif(False, reason="never")\n')
+
+
+def generate_fixtures(directory):
+    with open(os.path.join(directory, 'conftest.py'), 'w') as conftest:
+        conftest.write('import pytest\n\n\n')
+        for index in range(FIXTURES):
+            fixture = '@pytest.fixture(scope="session")\ndef fixture_{index}():\n    pass\n\n\n'
+            conftest.write(fixture.format(index=index))
+        names = ', '.join('fixture_{index}'.format(index=index) for index in range(FIXTURES))
+        conftest.write('@pytest.fixture(autouse=True)\ndef all_fixtures({names}):\n    pass\n'.format(names=names))
+
+
+def generate_suite(directory, markers=False):
+    for module in range(MODULES):
+        path = os.path.join(directory, 'test_module_{module}.py'.format(module=module))
+        with open(path, 'w') as module_file:
+            if markers:
+                module_file.write('import allure\nimport pytest\n\n\n')
+            for index in range(TESTS // MODULES):
+                if markers:
+                    module_file.write(MARKERS.format(module=module, index=index))
+                module_file.write('def test_{index}():\n    pass\n\n\n'.format(index=index))
+
+
+def run_pytest(directory, *args):
+    command = [sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider',
+               '-W', 'ignore::pytest.PytestUnknownMarkWarning', directory] + list(args)
+    with open(os.devnull, 'w') as devnull:
+        subprocess.check_call(command, stdout=devnull)
+
+
+def benchmarks(directory):
+    suite = os.path.join(directory, 'suite')
+    os.makedirs(suite)
+    generate_suite(suite)
+    alluredir = os.path.join(directory, 'allure-results')
+
+    yield 'without allure-pytest', lambda: run_pytest(suite, '-p', 'no:allure_pytest')
+    yield 'without --alluredir', lambda: run_pytest(suite)
+    yield 'with --alluredir', lambda: run_pytest(suite, '--alluredir', alluredir, '--clean-alluredir')
+
+    marked = os.path.join(directory, 'marked')
+    os.makedirs(marked)
+    generate_suite(marked, markers=True)
+    yield 'with --alluredir and markers', lambda: run_pytest(marked, '--alluredir', alluredir, '--clean-alluredir')
+
+    fixtures = os.path.join(directory, 'fixtures')
+    os.makedirs(fixtures)
+    generate_suite(fixtures)
+    generate_fixtures(fixtures)
+    yield 'with --alluredir and fixtures', lambda: run_pytest(fixtures, '--alluredir', alluredir, '--clean-alluredir')
+
+
+if __name__ == '__main__':
+    directory = tempfile.mkdtemp()
+    try:
+        results = main(benchmarks(directory), __file__, repeat=3, number=1)
+    finally:
+        shutil.rmtree(directory)
+    baseline = results.get('without allure-pytest')
+    for name in ('without --alluredir', 'with --alluredir'):
+        if baseline and name in results:
+            overhead = (results[name] - baseline) / TESTS
+            print('overhead per test {name}: {time:.1f} us'.format(name=name, time=overhead * 1e6))
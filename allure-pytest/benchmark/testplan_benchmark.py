@@ -0,0 +1,98 @@
+"""
+Measures selection of collected items by a test plan. Half of the plan entries
+select items by allure id and half by full name. The scan of the whole plan per
+item that ``select_by_testcase`` used to do runs on smaller sizes only. Plans
+are parsed once and cached, parsing is measured separately.
+
+    $ python benchmark/testplan_benchmark.py
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from allure_commons.types import LabelType
+from allure_commons.testplan import TestPlan, _read_tests
+from allure_pytest.plugin import select_by_testcase
+from allure_pytest.utils import allure_label, allure_full_name, ALLURE_LABEL_MARK
+from allure_commons_test.benchmark import main
+
+
+class Mark(object):
+    name = ALLURE_LABEL_MARK
+
+    def __init__(self, args, kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+
+class Item(object):
+    def __init__(self, index):
+        self.nodeid = 'tests/test_module_{module}.py::test_{index}'.format(module=index // 1000, index=index)
+        self.markers = [Mark((index,), {'label_type': LabelType.ID})] if index % 2 else []
+
+        self.own_markers = self.markers
+
+    def listchain(self):
+        return [self]
+
+    def iter_markers(self, name=None):
+        return iter([mark for mark in self.markers if name in (None, mark.name)])
+
+
+def plan_entries(items, size):
+    step = max(len(items) // size, 1)
+    for index, item in enumerate(items[::step][:size]):
+        if index % 2:
+            yield {'id': str(allure_label(item, LabelType.ID)[0]) if item.markers else 'missing'}
+        else:
+            yield {'selector': allure_full_name(item)}
+
+
+def scan_plan(items, planned_tests):
+    def is_planed(item):
+        allure_string_ids = list(map(str, allure_label(item, LabelType.ID)))
+        for planed_item in planned_tests:
+            if (str(planed_item.get('id')) in allure_string_ids
+                    or planed_item.get('selector') == allure_full_name(item)):
+                return True
+        return False
+
+    return [item for item in items if is_planed(item)]
+
+
+def write_plan(path, items, size):
+    with open(path, 'w') as plan_file:
+        json.dump({'version': '1.0', 'tests': list(plan_entries(items, size))}, plan_file)
+
+
+def benchmarks(directory):
+    for items_count, plan_size in ((1000, 1000), (150000, 40000)):
+        items = [Item(index) for index in range(items_count)]
+        path = os.path.join(directory, 'testplan-{plan}.json'.format(plan=plan_size))
+        write_plan(path, items, plan_size)
+        name = 'items={items} plan={plan}'.format(items=items_count, plan=plan_size)
+
+        def select(items=items, path=path):
+            os.environ['ALLURE_TESTPLAN_PATH'] = path
+            try:
+                return select_by_testcase(items)
+            finally:
+                del os.environ['ALLURE_TESTPLAN_PATH']
+
+        if items_count * plan_size <= 10 ** 6:
+            with open(path) as plan_file:
+                planned_tests = json.load(plan_file)['tests']
+            assert select() == scan_plan(items, planned_tests)
+            yield 'scan {name}'.format(name=name), lambda items=items, tests=planned_tests: scan_plan(items, tests)
+        yield 'select_by_testcase {name}'.format(name=name), select
+        yield 'parse plan={plan}'.format(plan=plan_size), lambda path=path: TestPlan(_read_tests(path))
+
+
+if __name__ == '__main__':
+    directory = tempfile.mkdtemp()
+    try:
+        main(benchmarks(directory), __file__, repeat=3, number=1)
+    finally:
+        shutil.rmtree(directory)
@@ -2,11 +2,11 @@ import pytest
 import allure_commons
 from allure_commons.utils import escape_non_unicode_symbols
 from allure_commons.utils import now
-from allure_commons.utils import uuid4
+from allure_commons.utils import uuid4, fast_uuid
 from allure_commons.utils import represent
-from allure_commons.utils import platform_label
-from allure_commons.utils import host_tag, thread_tag
+from allure_commons.utils import session_labels
 from allure_commons.reporter import AllureReporter
+from allure_commons.profiler import Profiler, NO_MEASUREMENT
 from allure_commons.model2 import TestStepResult, TestResult, TestBeforeResult, TestAfterResult
 from allure_commons.model2 import TestResultContainer
 from allure_commons.model2 import StatusDetails
@@ -30,8 +30,12 @@ class AllureListener(object):
         self.config = config
         self.allure_logger = AllureReporter()
         self._cache = ItemCache()
-        self._host = host_tag()
-        self._thread = thread_tag()
+        self._fixturedefs = dict()
+        self._session_labels = session_labels('pytest')
+        self.profiler = Profiler() if config.option.allure_profile else None
+
+    def _measure(self, name):
+        return self.profiler.measure(name) if self.profiler else NO_MEASUREMENT
 
     @allure_commons.hookimpl
     def start_step(self, uuid, title, params):
@@ -60,23 +64,39 @@ class AllureListener(object):
 
     @pytest.hookimpl(hookwrapper=True, tryfirst=True)
     def pytest_runtest_protocol(self, item, nextitem):
-        uuid = self._cache.push(item.nodeid)
-        test_result = TestResult(name=item.name, uuid=uuid, start=now(), stop=now())
-        self.allure_logger.schedule_test(uuid, test_result)
+        if self.profiler:
+            self.profiler.start_test(item.nodeid)
+        with self._measure('pytest_runtest_protocol'):
+            uuid = self._cache.push(item.nodeid)
+            test_result = TestResult(name=item.name, uuid=uuid, start=now(), stop=now())
+            self.allure_logger.schedule_test(uuid, test_result)
         yield
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_setup(self, item):
-        if not self._cache.get(item.nodeid):
-            uuid = self._cache.push(item.nodeid)
-            test_result = TestResult(name=item.name, uuid=uuid, start=now(), stop=now())
-            self.allure_logger.schedule_test(uuid, test_result)
+        with self._measure('pytest_runtest_setup'):
+            if not self._cache.get(item.nodeid):
+                uuid = self._cache.push(item.nodeid)
+                test_result = TestResult(name=item.name, uuid=uuid, start=now(), stop=now())
+                self.allure_logger.schedule_test(uuid, test_result)
 
         yield
 
+        with self._measure('pytest_runtest_setup'):
+            self._update_test(item)
+
+    def _test_fixtures(self, item):
+        # fixtures resolve the same way for every test with the same fixture names and parent node
+        key = tuple(getattr(item, 'fixturenames', ())), item.parent.nodeid if item.parent else ''
+        fixturedefs = self._fixturedefs.get(key)
+        if fixturedefs is None:
+            fixturedefs = self._fixturedefs[key] = _test_fixtures(item)
+        return fixturedefs
+
+    def _update_test(self, item):
         uuid = self._cache.get(item.nodeid)
         test_result = self.allure_logger.get_test(uuid)
-        for fixturedef in _test_fixtures(item):
+        for fixturedef in self._test_fixtures(item):
             group_uuid = self._cache.get(fixturedef)
             if not group_uuid:
                 group_uuid = self._cache.push(fixturedef)
@@ -97,10 +117,11 @@ class AllureListener(object):
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_call(self, item):
-        uuid = self._cache.get(item.nodeid)
-        test_result = self.allure_logger.get_test(uuid)
-        if test_result:
-            test_result.start = now()
+        with self._measure('pytest_runtest_call'):
+            uuid = self._cache.get(item.nodeid)
+            test_result = self.allure_logger.get_test(uuid)
+            if test_result:
+                test_result.start = now()
         yield
         if test_result:
             test_result.stop = now()
@@ -108,61 +129,67 @@ class AllureListener(object):
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_teardown(self, item):
         yield
+        with self._measure('pytest_runtest_teardown'):
+            self._add_labels(item)
+
+    def _add_labels(self, item):
         uuid = self._cache.get(item.nodeid)
         test_result = self.allure_logger.get_test(uuid)
         test_result.labels.extend([Label(name=name, value=value) for name, value in allure_labels(item)])
         test_result.labels.extend([Label(name=LabelType.TAG, value=value) for value in pytest_markers(item)])
         test_result.labels.extend([Label(name=name, value=value) for name, value in allure_suite_labels(item)])
-        test_result.labels.append(Label(name=LabelType.HOST, value=self._host))
-        test_result.labels.append(Label(name=LabelType.THREAD, value=self._thread))
-        test_result.labels.append(Label(name=LabelType.FRAMEWORK, value='pytest'))
-        test_result.labels.append(Label(name=LabelType.LANGUAGE, value=platform_label()))
+        test_result.labels.extend(self._session_labels)
         test_result.labels.append(Label(name='package', value=allure_package(item)))
         test_result.links.extend([Link(link_type, url, name) for link_type, url, name in allure_links(item)])
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_fixture_setup(self, fixturedef, request):
-        fixture_name = getattr(fixturedef.func, '__allure_display_name__', fixturedef.argname)
+        with self._measure('pytest_fixture_setup'):
+            fixture_name = getattr(fixturedef.func, '__allure_display_name__', fixturedef.argname)
 
-        container_uuid = self._cache.get(fixturedef)
+            container_uuid = self._cache.get(fixturedef)
 
-        if not container_uuid:
-            container_uuid = self._cache.push(fixturedef)
-            container = TestResultContainer(uuid=container_uuid)
-            self.allure_logger.start_group(container_uuid, container)
+            if not container_uuid:
+                container_uuid = self._cache.push(fixturedef)
+                container = TestResultContainer(uuid=container_uuid)
+                self.allure_logger.start_group(container_uuid, container)
 
-        self.allure_logger.update_group(container_uuid, start=now())
+            self.allure_logger.update_group(container_uuid, start=now())
 
-        before_fixture_uuid = uuid4()
-        before_fixture = TestBeforeResult(name=fixture_name, start=now())
-        self.allure_logger.start_before_fixture(container_uuid, before_fixture_uuid, before_fixture)
+            before_fixture_uuid = fast_uuid()
+            before_fixture = TestBeforeResult(name=fixture_name, start=now())
+            self.allure_logger.start_before_fixture(container_uuid, before_fixture_uuid, before_fixture)
 
         outcome = yield
 
-        self.allure_logger.stop_before_fixture(before_fixture_uuid,
-                                               stop=now(),
-                                               status=get_outcome_status(outcome),
-                                               statusDetails=get_outcome_status_details(outcome))
+        with self._measure('pytest_fixture_setup'):
+            self.allure_logger.stop_before_fixture(before_fixture_uuid,
+                                                   stop=now(),
+                                                   status=get_outcome_status(outcome),
+                                                   statusDetails=get_outcome_status_details(outcome))
 
-        finalizers = getattr(fixturedef, '_finalizers', [])
-        for index, finalizer in enumerate(finalizers):
-            name = '{fixture}::{finalizer}'.format(fixture=fixture_name,
-                                                   finalizer=getattr(finalizer, "__name__", index))
-            finalizers[index] = allure_commons.fixture(finalizer, parent_uuid=container_uuid, name=name)
+            finalizers = getattr(fixturedef, '_finalizers', [])
+            for index, finalizer in enumerate(finalizers):
+                name = '{fixture}::{finalizer}'.format(fixture=fixture_name,
+                                                       finalizer=getattr(finalizer, "__name__", index))
+                finalizers[index] = allure_commons.fixture(finalizer, parent_uuid=container_uuid, name=name)
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_fixture_post_finalizer(self, fixturedef):
         yield
-        if hasattr(fixturedef, 'cached_result') and self._cache.get(fixturedef):
-            container_uuid = self._cache.pop(fixturedef)
-            self.allure_logger.stop_group(container_uuid, stop=now())
+        with self._measure('pytest_fixture_post_finalizer'):
+            if hasattr(fixturedef, 'cached_result') and self._cache.get(fixturedef):
+                container_uuid = self._cache.pop(fixturedef)
+                self.allure_logger.stop_group(container_uuid, stop=now())
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_makereport(self, item, call):
-        uuid = self._cache.get(item.nodeid)
-
         report = (yield).get_result()
+        with self._measure('pytest_runtest_makereport'):
+            self._update_status(item, call, report)
 
+    def _update_status(self, item, call, report):
+        uuid = self._cache.get(item.nodeid)
         test_result = self.allure_logger.get_test(uuid)
         status = get_pytest_report_status(report)
         status_details = None
@@ -211,17 +238,40 @@ class AllureListener(object):
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_logfinish(self, nodeid, location):
         yield
-        uuid = self._cache.pop(nodeid)
-        if uuid:
-            self.allure_logger.close_test(uuid)
+        with self._measure('pytest_runtest_logfinish'):
+            uuid = self._cache.pop(nodeid)
+            if uuid and self.profiler:
+                self._attach_overhead(nodeid)
+            if uuid:
+                self.allure_logger.close_test(uuid)
+
+    def _attach_overhead(self, nodeid):
+        sources = sorted(self.profiler.stop_test(nodeid).items(), key=lambda item: item[1], reverse=True)
+        lines = ['{name:<40} {time:>10.3f} ms'.format(name=name, time=seconds * 1000) for name, seconds in sources]
+        lines.insert(0, '{name:<40} {time:>10.3f} ms'.format(name='total', time=self.profiler.tests[nodeid] * 1000))
+        self.allure_logger.attach_data(fast_uuid(), '\n'.join(lines), name='allure overhead',
+                                       attachment_type=AttachmentType.TEXT)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        summary = self.allure_logger.attachment_budget.summary()
+        if summary:
+            terminalreporter.write_sep('-', 'allure attachment budget')
+            for line in summary:
+                terminalreporter.write_line(line)
+        if self.profiler:
+            terminalreporter.write_sep('-', 'allure overhead')
+            for line in self.profiler.summary():
+                terminalreporter.write_line(line)
 
     @allure_commons.hookimpl
     def attach_data(self, body, name, attachment_type, extension):
-        self.allure_logger.attach_data(uuid4(), body, name=name, attachment_type=attachment_type, extension=extension)
+        self.allure_logger.attach_data(fast_uuid(), body, name=name, attachment_type=attachment_type,
+                                       extension=extension)
 
     @allure_commons.hookimpl
     def attach_file(self, source, name, attachment_type, extension):
-        self.allure_logger.attach_file(uuid4(), source, name=name, attachment_type=attachment_type, extension=extension)
+        self.allure_logger.attach_file(fast_uuid(), source, name=name, attachment_type=attachment_type,
+                                       extension=extension)
 
     @allure_commons.hookimpl
     def add_title(self, test_title):
@@ -261,18 +311,25 @@ class AllureListener(object):
 
 
 class ItemCache(object):
+    """
+    Uuids of tests by node id and of fixture containers by fixture definition. Definitions are compared
+    by identity, so two definitions with the same name, scope and base id get their own containers.
+    """
 
     def __init__(self):
         self._items = dict()
 
     def get(self, _id):
-        return self._items.get(str(_id))
+        return self._items.get(_id)
 
     def push(self, _id):
-        return self._items.setdefault(str(_id), uuid4())
+        uuid = self._items.get(_id)
+        if uuid is None:
+            uuid = self._items[_id] = uuid4()
+        return uuid
 
     def pop(self, _id):
-        return self._items.pop(str(_id), None)
+        return self._items.pop(_id, None)
 
 
 def _test_fixtures(item):
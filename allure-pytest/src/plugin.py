@@ -6,7 +6,8 @@ import os
 
 from allure_commons.types import LabelType
 from allure_commons.logger import AllureFileLogger
-from allure_commons.utils import get_testplan
+from allure_commons.serializer import JSON_BACKENDS
+from allure_commons.testplan import load_testplan
 
 from allure_pytest.utils import allure_label, allure_labels, allure_full_name
 from allure_pytest.helper import AllureTestHelper, AllureTitleHelper
@@ -34,6 +35,20 @@ def pytest_addoption(parser):
                                            dest="attach_capture",
                                            help="Do not attach pytest captured logging/stdout/stderr to report")
 
+    parser.getgroup("reporting").addoption('--allure-json-backend',
+                                           action="store",
+                                           dest="allure_json_backend",
+                                           choices=['auto'] + list(JSON_BACKENDS),
+                                           default=None,
+                                           help="JSON encoder for result files. The fastest installed one is used "
+                                                "by default")
+
+    parser.getgroup("reporting").addoption('--allure-profile',
+                                           action="store_true",
+                                           dest="allure_profile",
+                                           help="Measure time spent in Allure code, attach it to every test and "
+                                                "print a summary of the top overhead sources")
+
     def label_type(type_name, legal_values=set()):
         def a_label_type(string):
             atoms = set(string.split(','))
@@ -130,9 +145,12 @@ def pytest_configure(config):
         config.pluginmanager.register(test_listener)
         allure_commons.plugin_manager.register(test_listener)
         config.add_cleanup(cleanup_factory(test_listener))
+        if test_listener.profiler:
+            config.add_cleanup(test_listener.profiler.attach(allure_commons.plugin_manager))
 
-        file_logger = AllureFileLogger(report_dir, clean)
+        file_logger = AllureFileLogger(report_dir, clean, json_backend=config.option.allure_json_backend)
         allure_commons.plugin_manager.register(file_logger)
+        config.add_cleanup(file_logger.close)
         config.add_cleanup(cleanup_factory(file_logger))
 
     config.addinivalue_line("markers", "{mark}: allure label marker".format(mark=ALLURE_LABEL_MARK))
@@ -150,22 +168,16 @@ def select_by_labels(items, config):
 
 
 def select_by_testcase(items):
-    planned_tests = get_testplan()
+    testplan = load_testplan()
 
-    if planned_tests:
+    if testplan:
 
         def is_planed(item):
             allure_ids = allure_label(item, LabelType.ID)
-            allure_string_ids = list(map(str, allure_ids))
-            for planed_item in planned_tests:
-                planed_item_string_id = str(planed_item.get("id"))
-                planed_item_selector = planed_item.get("selector")
-                if (
-                    planed_item_string_id in allure_string_ids
-                    or planed_item_selector == allure_full_name(item)
-                ):
-                    return True
-            return False
+            return (
+                any(testplan.contains_id(allure_id) for allure_id in allure_ids)
+                or testplan.contains_selector(allure_full_name(item))
+            )
 
         return [item for item in items if is_planed(item)]
     else:
@@ -25,8 +25,37 @@ ALLURE_UNIQUE_LABELS = [
 ]
 
 
+class _ItemMarkers(object):
+    """
+    Markers of an item and its parents, closest first, grouped by name. Labels, links and tags are parsed
+    from them once and kept on the item until a marker is added to it or to its parents.
+    """
+
+    def __init__(self, item, version):
+        self.version = version
+        self.by_name = {}
+        for mark in item.iter_markers():
+            self.by_name.setdefault(mark.name, []).append(mark)
+        self.labels = None
+        self.links = None
+        self.tags = None
+
+    def closest(self, name):
+        marks = self.by_name.get(name)
+        return marks[0] if marks else None
+
+
+def _item_markers(item):
+    version = tuple(len(node.own_markers) for node in item.listchain())
+    markers = getattr(item, '_allure_markers', None)
+    if markers is None or markers.version != version:
+        markers = _ItemMarkers(item, version)
+        item._allure_markers = markers
+    return markers
+
+
 def get_marker_value(item, keyword):
-    marker = item.get_closest_marker(keyword)
+    marker = _item_markers(item).closest(keyword)
     return marker.args[0] if marker and marker.args else None
 
 
@@ -48,42 +77,52 @@ def allure_description_html(item):
 
 def allure_label(item, label):
     labels = []
-    for mark in item.iter_markers(name=ALLURE_LABEL_MARK):
+    for mark in _item_markers(item).by_name.get(ALLURE_LABEL_MARK, ()):
         if mark.kwargs.get("label_type") == label:
             labels.extend(mark.args)
     return labels
 
 
 def allure_labels(item):
-    unique_labels = dict()
-    labels = set()
-    for mark in item.iter_markers(name=ALLURE_LABEL_MARK):
-        label_type = mark.kwargs["label_type"]
-        if label_type in ALLURE_UNIQUE_LABELS:
-            if label_type not in unique_labels.keys():
-                unique_labels[label_type] = mark.args[0]
-        else:
-            for arg in mark.args:
-                labels.add((label_type, arg))
-    for k, v in unique_labels.items():
-        labels.add((k, v))
-    return labels
+    markers = _item_markers(item)
+    if markers.labels is None:
+        unique_labels = dict()
+        labels = set()
+        for mark in markers.by_name.get(ALLURE_LABEL_MARK, ()):
+            label_type = mark.kwargs["label_type"]
+            if label_type in ALLURE_UNIQUE_LABELS:
+                if label_type not in unique_labels.keys():
+                    unique_labels[label_type] = mark.args[0]
+            else:
+                for arg in mark.args:
+                    labels.add((label_type, arg))
+        for k, v in unique_labels.items():
+            labels.add((k, v))
+        markers.labels = frozenset(labels)
+    return set(markers.labels)
 
 
 def allure_links(item):
-    for mark in item.iter_markers(name=ALLURE_LINK_MARK):
-        yield (mark.kwargs["link_type"], mark.args[0], mark.kwargs["name"])
+    markers = _item_markers(item)
+    if markers.links is None:
+        markers.links = [(mark.kwargs["link_type"], mark.args[0], mark.kwargs["name"])
+                         for mark in markers.by_name.get(ALLURE_LINK_MARK, ())]
+    return iter(markers.links)
 
 
 def pytest_markers(item):
-    for keyword in item.keywords.keys():
-        if any([keyword.startswith('allure_'), keyword == 'parametrize']):
-            continue
-        marker = item.get_closest_marker(keyword)
-        if marker is None:
-            continue
-
-        yield mark_to_str(marker)
+    markers = _item_markers(item)
+    if markers.tags is None:
+        markers.tags = []
+        for keyword in item.keywords.keys():
+            if any([keyword.startswith('allure_'), keyword == 'parametrize']):
+                continue
+            marker = markers.closest(keyword)
+            if marker is None:
+                continue
+
+            markers.tags.append(mark_to_str(marker))
+    return iter(markers.tags)
 
 
 def mark_to_str(marker):
@@ -0,0 +1,32 @@
+from hamcrest import assert_that, all_of, has_property, has_value, has_length, less_than_or_equal_to
+from hamcrest import starts_with, ends_with, contains_string
+
+
+def test_attachment_budget(allured_testdir, monkeypatch):
+    """
+    >>> import allure
+
+    >>> def test_attachment_budget_example():
+    ...     allure.attach("a" * 10000, name="large")
+    ...     print("head" + "x" * 10000 + "tail")
+    """
+    monkeypatch.setenv("ALLURE_MAX_ATTACHMENT_SIZE", "500")
+    monkeypatch.setenv("ALLURE_MAX_TEST_ATTACHMENTS_SIZE", "800")
+
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report,
+                has_property("attachments",
+                             all_of(
+                                 has_value(all_of(starts_with("aaa"),
+                                                  contains_string("bytes truncated by allure"),
+                                                  ends_with("aaa"),
+                                                  has_length(less_than_or_equal_to(500)))),
+                                 has_value(all_of(starts_with("head"),
+                                                  contains_string("bytes truncated by allure"),
+                                                  ends_with("tail\n"),
+                                                  has_length(less_than_or_equal_to(300))))
+                             )
+                             )
+                )
@@ -2,6 +2,7 @@ import allure
 import pytest
 from hamcrest import assert_that, has_entry, greater_than, all_of
 from allure_commons_test.report import has_test_case
+from allure_commons_test.result import has_step
 from allure_commons.utils import now
 
 
@@ -87,3 +88,27 @@ def test_with_fixture_finalizer_duration(allured_testdir, snipped):
                                   has_entry("stop", greater_than(timestamp))
                               ))
                 )
+
+
+def test_microsecond_timestamps(allured_testdir, monkeypatch):
+    allured_testdir.testdir.makepyfile("""
+        import allure
+
+        def test_microsecond_timestamps_example():
+            with allure.step("fast step"):
+                pass
+    """)
+
+    monkeypatch.setattr("allure_commons.utils.MICROSECOND_TIMESTAMPS", True)
+    timestamp = now()
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_microsecond_timestamps_example",
+                              has_entry("startMicros", greater_than(timestamp.micros)),
+                              has_step("fast step",
+                                       has_entry("startMicros", greater_than(timestamp.micros)),
+                                       has_entry("stopMicros", greater_than(timestamp.micros))
+                                       )
+                              )
+                )
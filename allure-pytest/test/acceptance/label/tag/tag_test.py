@@ -3,7 +3,7 @@
 from allure_commons.utils import represent
 from hamcrest import assert_that, not_
 from allure_commons_test.report import has_test_case
-from allure_commons_test.label import has_tag
+from allure_commons_test.label import has_tag, has_feature
 
 
 def test_pytest_marker(executed_docstring_source):
@@ -126,3 +126,31 @@ def test_pytest_marker_with_kwargs_utf_encoding(executed_docstring_source):
                               has_tag("marker(stuff=%s)" % represent('я'))
                               )
                 )
+
+
+def test_pytest_marker_added_at_runtime(allured_testdir):
+    """
+    >>> import pytest
+    >>> import allure
+
+    >>> @pytest.fixture
+    ... def runtime_markers(request):
+    ...     request.node.add_marker(pytest.mark.runtime)
+    ...     request.node.add_marker(allure.feature("runtime feature"))
+
+    >>> @allure.feature("static feature")
+    ... def test_pytest_marker_added_at_runtime_example(runtime_markers):
+    ...     pass
+    """
+
+    allured_testdir.parse_docstring_source()
+    # labels are read for the selection before the fixture adds markers
+    allured_testdir.run_with_allure("--allure-features", "static feature")
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_pytest_marker_added_at_runtime_example",
+                              has_tag("runtime"),
+                              has_feature("static feature"),
+                              has_feature("runtime feature")
+                              )
+                )
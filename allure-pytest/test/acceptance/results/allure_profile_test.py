@@ -0,0 +1,36 @@
+from hamcrest import assert_that, not_
+from allure_commons_test.report import has_test_case
+from allure_commons_test.result import has_attachment
+
+
+def test_allure_profile(allured_testdir):
+    """
+    >>> import allure
+
+    >>> def test_allure_profile_example():
+    ...     with allure.step("step"):
+    ...         allure.attach("body", name="attachment")
+    """
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure("--allure-profile")
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_allure_profile_example",
+                              has_attachment(name="allure overhead")
+                              )
+                )
+
+
+def test_without_allure_profile(allured_testdir):
+    """
+    >>> def test_without_allure_profile_example():
+    ...     pass
+    """
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_without_allure_profile_example",
+                              not_(has_attachment(name="allure overhead"))
+                              )
+                )
@@ -0,0 +1,78 @@
+import pytest
+from hamcrest import assert_that, all_of, has_length, has_property, has_item, contains_string
+from allure_commons.logger import AsyncWriter
+from allure_commons_test.report import has_test_case
+from allure_commons_test.result import has_attachment, has_step
+
+
+@pytest.mark.real_logger
+@pytest.mark.parametrize("writers", ["1", "3"])
+def test_async_writer(allured_testdir, monkeypatch, writers):
+    """
+    >>> import pytest
+    >>> import allure
+
+    >>> @pytest.mark.parametrize("index", range(20))
+    ... def test_async_writer_example(index):
+    ...     with allure.step("Step"):
+    ...         allure.attach("attachment body {}".format(index), name="attachment")
+    """
+    monkeypatch.setenv("ALLURE_ASYNC_WRITERS", writers)
+
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report, has_property("test_cases", has_length(20)))
+    assert_that(allured_testdir.allure_report,
+                has_property("attachments",
+                             all_of(
+                                 has_item(contains_string("attachment body 0")),
+                                 has_item(contains_string("attachment body 19"))
+                             )
+                             )
+                )
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_async_writer_example[0]",
+                              has_step("Step",
+                                       has_attachment(name="attachment")
+                                       )
+                              )
+                )
+
+
+@pytest.mark.real_logger
+def test_async_writer_attach_removed_file(allured_testdir, monkeypatch):
+    """
+    >>> import os
+    >>> import allure
+
+    >>> def test_async_writer_attach_removed_file_example():
+    ...     allure.attach.file("video.bin", name="video")
+    ...     os.remove("video.bin")
+    """
+    monkeypatch.setenv("ALLURE_ASYNC_WRITERS", "1")
+
+    allured_testdir.parse_docstring_source()
+    allured_testdir.testdir.makefile(".bin", video="frames")
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report, has_property("attachments", has_item("frames")))
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_async_writer_attach_removed_file_example",
+                              has_attachment(name="video")
+                              )
+                )
+
+
+def test_async_writer_errors(caplog):
+    writer = AsyncWriter()
+    writer.submit("1-result.json", int, "1")
+    writer.submit("2-result.json", int, "two")
+    writer.submit("3-result.json", int, "three")
+    with pytest.raises(IOError) as error:
+        writer.close()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert_that(messages, all_of(has_item(contains_string("2-result.json")),
+                                 has_item(contains_string("3-result.json"))))
+    assert_that(str(error.value), all_of(contains_string("2-result.json"), contains_string("3-result.json")))
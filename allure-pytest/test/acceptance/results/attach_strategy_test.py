@@ -0,0 +1,39 @@
+import os
+import pytest
+from hamcrest import assert_that, has_property, has_item, equal_to
+from allure_commons_test.report import has_test_case
+from allure_commons_test.result import has_attachment
+
+
+@pytest.mark.real_logger
+@pytest.mark.parametrize("strategy", ["copy", "hardlink", "reflink", "symlink", "move"])
+def test_attach_strategy(allured_testdir, monkeypatch, strategy):
+    """
+    >>> import allure
+
+    >>> def test_attach_strategy_example():
+    ...     allure.attach.file("video.bin", name="video")
+    """
+    monkeypatch.setenv("ALLURE_ATTACH_STRATEGY", strategy)
+
+    allured_testdir.parse_docstring_source()
+    allured_testdir.testdir.makefile(".bin", video="frames")
+    allured_testdir.run_with_allure()
+
+    report_dir = allured_testdir.testdir.tmpdir.strpath
+    source = os.path.join(report_dir, "video.bin")
+    [test_case] = allured_testdir.allure_report.test_cases
+    attachment = os.path.join(report_dir, test_case["attachments"][0]["source"])
+
+    assert_that(allured_testdir.allure_report, has_property("attachments", has_item("frames")))
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_attach_strategy_example",
+                              has_attachment(name="video")
+                              )
+                )
+    assert_that(os.path.exists(source), equal_to(strategy != "move"))
+    assert_that(os.path.islink(attachment), equal_to(strategy == "symlink"))
+    if strategy != "move":
+        assert_that(os.path.samefile(source, attachment), equal_to(strategy in ("hardlink", "symlink")))
+        with open(source, "rb") as source_file, open(attachment, "rb") as attachment_file:
+            assert_that(attachment_file.read(), equal_to(source_file.read()))
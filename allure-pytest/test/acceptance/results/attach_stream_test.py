@@ -0,0 +1,98 @@
+import pytest
+from hamcrest import assert_that, all_of, has_property, has_item, is_not
+from allure_commons_test.report import has_test_case
+from allure_commons_test.result import has_attachment, with_status
+
+
+@pytest.mark.real_logger
+def test_attach_stream(allured_testdir):
+    """
+    >>> import io
+    >>> import allure
+
+    >>> def test_attach_stream_example():
+    ...     allure.attach(io.BytesIO(b"binary stream"), name="bytes io")
+    ...     allure.attach(io.StringIO(u"text stream"), name="string io")
+    ...     allure.attach((u"line {}\\n".format(index) for index in range(3)), name="generator")
+    ...     allure.attach(memoryview(b"memory view"), name="memoryview")
+    ...     with open("log.txt") as log:
+    ...         allure.attach(log, name="file object")
+    """
+    allured_testdir.parse_docstring_source()
+    allured_testdir.testdir.makefile(".txt", log="file object")
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report,
+                has_property("attachments",
+                             all_of(
+                                 has_item("binary stream"),
+                                 has_item("text stream"),
+                                 has_item("line 0\nline 1\nline 2\n"),
+                                 has_item("memory view"),
+                                 has_item("file object")
+                             )
+                             )
+                )
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_attach_stream_example",
+                              has_attachment(name="bytes io"),
+                              has_attachment(name="generator"),
+                              has_attachment(name="file object")
+                              )
+                )
+
+
+@pytest.mark.real_logger
+def test_attach_stream_to_several_loggers(allured_testdir):
+    """
+    >>> import io
+    >>> import allure
+    >>> from allure_commons import plugin_manager
+    >>> from allure_commons.logger import AllureMemoryLogger
+
+    >>> def test_attach_stream_to_several_loggers_example():
+    ...     memory_logger = AllureMemoryLogger()
+    ...     plugin_manager.register(memory_logger)
+    ...     try:
+    ...         allure.attach(io.BytesIO(b"binary stream"), name="bytes io")
+    ...         allure.attach((u"line {}\\n".format(index) for index in range(3)), name="generator")
+    ...     finally:
+    ...         plugin_manager.unregister(memory_logger)
+    ...     assert set(memory_logger.attachments.values()) == {b"binary stream", b"line 0\\nline 1\\nline 2\\n"}
+    """
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report,
+                all_of(
+                    has_property("attachments",
+                                 all_of(
+                                     has_item("binary stream"),
+                                     has_item("line 0\nline 1\nline 2\n")
+                                 )
+                                 ),
+                    has_test_case("test_attach_stream_to_several_loggers_example",
+                                  with_status("passed")
+                                  )
+                )
+                )
+
+
+def test_attach_unsupported_body(allured_testdir):
+    """
+    >>> import pytest
+    >>> import allure
+
+    >>> def test_attach_unsupported_body_example():
+    ...     with pytest.raises(TypeError):
+    ...         allure.attach({"key": "value"}, name="dict")
+    """
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_attach_unsupported_body_example",
+                              with_status("passed"),
+                              is_not(has_attachment(name="dict"))
+                              )
+                )
@@ -0,0 +1,52 @@
+import os
+import fnmatch
+import pytest
+from hamcrest import assert_that, has_property, has_item, has_entries, empty, ends_with, is_not
+from allure_commons.attachments import COMPRESSIONS
+from allure_commons.results import main
+from allure_commons_test.report import AllureReport
+
+
+@pytest.mark.real_logger
+@pytest.mark.parametrize("compression", list(COMPRESSIONS))
+def test_compress_attachments(allured_testdir, monkeypatch, compression):
+    """
+    >>> import io
+    >>> import allure
+
+    >>> def test_compress_attachments_example():
+    ...     allure.attach("x" * 100, name="large", attachment_type=allure.attachment_type.TEXT)
+    ...     allure.attach(io.StringIO(u"y" * 100), name="large stream", attachment_type=allure.attachment_type.TEXT)
+    ...     allure.attach("small", name="small", attachment_type=allure.attachment_type.TEXT)
+    ...     allure.attach(b"z" * 100, name="image", attachment_type=allure.attachment_type.PNG)
+    """
+    monkeypatch.setenv("ALLURE_COMPRESS_ATTACHMENTS", compression)
+    monkeypatch.setenv("ALLURE_COMPRESS_THRESHOLD", "64")
+
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    report_dir = allured_testdir.testdir.tmpdir.strpath
+    suffix = COMPRESSIONS[compression].suffix
+    type_suffix = COMPRESSIONS[compression].type_suffix
+    [test_case] = allured_testdir.allure_report.test_cases
+    attachments = {attachment["name"]: attachment for attachment in test_case["attachments"]}
+
+    assert_that(attachments["large"], has_entries(source=ends_with(suffix), type="text/plain" + type_suffix))
+    assert_that(attachments["large stream"], has_entries(source=ends_with(suffix), type="text/plain" + type_suffix))
+    assert_that(attachments["small"], has_entries(source=ends_with(".txt"), type="text/plain"))
+    assert_that(attachments["image"], has_entries(source=ends_with(".png"), type="image/png"))
+    for attachment in attachments.values():
+        assert_that(os.path.exists(os.path.join(report_dir, attachment["source"])))
+
+    main(["decompress", report_dir])
+
+    assert_that(fnmatch.filter(os.listdir(report_dir), "*" + suffix), empty())
+    [test_case] = AllureReport(report_dir).test_cases
+    for attachment in test_case["attachments"]:
+        assert_that(attachment, has_entries(source=is_not(ends_with(suffix)), type=is_not(ends_with(type_suffix))))
+        assert_that(os.path.exists(os.path.join(report_dir, attachment["source"])))
+    assert_that(AllureReport(report_dir),
+                has_property("attachments", has_item("x" * 100)))
+    assert_that(AllureReport(report_dir),
+                has_property("attachments", has_item("y" * 100)))
@@ -0,0 +1,42 @@
+import os
+import fnmatch
+import pytest
+from hamcrest import assert_that, has_length, has_property, has_item, contains_string, only_contains, is_in
+from allure_commons_test.report import has_test_case
+from allure_commons_test.result import has_attachment
+
+
+@pytest.mark.real_logger
+def test_deduplicate_attachments(allured_testdir, monkeypatch):
+    """
+    >>> import pytest
+    >>> import allure
+
+    >>> @pytest.mark.parametrize("index", range(5))
+    ... def test_deduplicate_attachments_example(index, tmpdir):
+    ...     allure.attach("same body", name="data", attachment_type=allure.attachment_type.TEXT)
+    ...     attached_file = tmpdir.join("attached.txt")
+    ...     attached_file.write("same body")
+    ...     allure.attach.file(attached_file.strpath, name="file", attachment_type=allure.attachment_type.TEXT)
+    """
+    monkeypatch.setenv("ALLURE_DEDUPLICATE_ATTACHMENTS", "yep")
+
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    report_dir = allured_testdir.testdir.tmpdir.strpath
+    attachment_files = fnmatch.filter(os.listdir(report_dir), "*-attachment.*")
+    sources = [attachment["source"]
+               for test_case in allured_testdir.allure_report.test_cases
+               for attachment in test_case["attachments"]]
+
+    assert_that(attachment_files, has_length(1))
+    assert_that(sources, has_length(10))
+    assert_that(sources, only_contains(is_in(attachment_files)))
+    assert_that(allured_testdir.allure_report, has_property("attachments", has_item(contains_string("same body"))))
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_deduplicate_attachments_example[4]",
+                              has_attachment(name="data"),
+                              has_attachment(name="file")
+                              )
+                )
@@ -0,0 +1,36 @@
+import pytest
+from hamcrest import assert_that
+from allure_commons.serializer import JSON_BACKENDS
+from allure_commons_test.report import has_test_case
+from allure_commons_test.result import has_step, has_parameter
+
+
+@pytest.mark.real_logger
+@pytest.mark.parametrize("indent", [True, False])
+@pytest.mark.parametrize("backend", list(JSON_BACKENDS))
+def test_json_backend(allured_testdir, monkeypatch, backend, indent):
+    """
+    >>> import allure
+
+    >>> @allure.step("Step with unicode привет and {arg}")
+    ... def step(arg):
+    ...     pass
+
+    >>> def test_json_backend_example():
+    ...     step("/path/")
+    """
+    if indent:
+        monkeypatch.setenv("ALLURE_INDENT_OUTPUT", "yep")
+    else:
+        monkeypatch.delenv("ALLURE_INDENT_OUTPUT", raising=False)
+
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure("--allure-json-backend={backend}".format(backend=backend))
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_json_backend_example",
+                              has_step(u"Step with unicode привет and '/path/'",
+                                       has_parameter("arg", "'/path/'")
+                                       )
+                              )
+                )
@@ -0,0 +1,47 @@
+import os
+import fnmatch
+import pytest
+from hamcrest import assert_that, has_length, has_property, empty
+from allure_commons.results import main
+from allure_commons_test.report import AllureReport, has_test_case
+from allure_commons_test.result import has_step
+from allure_commons_test.container import has_container, has_before
+
+
+@pytest.mark.real_logger
+def test_ndjson_output(allured_testdir, monkeypatch):
+    """
+    >>> import pytest
+    >>> import allure
+
+    >>> @pytest.fixture
+    ... def fixture():
+    ...     pass
+
+    >>> @pytest.mark.parametrize("index", range(5))
+    ... def test_ndjson_output_example(fixture, index):
+    ...     with allure.step("Step"):
+    ...         pass
+    """
+    monkeypatch.setenv("ALLURE_NDJSON_OUTPUT", "yep")
+
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    report_dir = allured_testdir.testdir.tmpdir.strpath
+    assert_that(allured_testdir.allure_report, has_property("test_cases", empty()))
+    assert_that(fnmatch.filter(os.listdir(report_dir), "*-results.ndjson"), has_length(1))
+
+    main(["explode", report_dir])
+    allure_report = AllureReport(report_dir)
+
+    assert_that(fnmatch.filter(os.listdir(report_dir), "*-results.ndjson"), empty())
+    assert_that(allure_report, has_property("test_cases", has_length(5)))
+    assert_that(allure_report,
+                has_test_case("test_ndjson_output_example[0]",
+                              has_step("Step"),
+                              has_container(allure_report,
+                                            has_before("fixture")
+                                            )
+                              )
+                )
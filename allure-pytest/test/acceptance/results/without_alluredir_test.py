@@ -0,0 +1,29 @@
+def test_without_alluredir(allured_testdir):
+    """
+    >>> import allure
+    >>> import allure_commons
+    >>> from allure_commons._core import reporting_enabled
+
+    >>> @allure.step("step {0}")
+    ... def step(value):
+    ...     with allure.step("nested step"):
+    ...         allure.attach("body", name="attachment")
+    ...     allure.dynamic.label("owner", "me")
+    ...     return value
+
+    >>> @allure.step
+    ... def failed_step():
+    ...     assert False
+
+    >>> def test_without_alluredir_example():
+    ...     assert not reporting_enabled()
+    ...     assert step(42) == 42
+    ...     assert allure_commons.fixture(step)(43) == 43
+
+    >>> def test_failed_step_without_alluredir_example():
+    ...     failed_step()
+    """
+    allured_testdir.parse_docstring_source()
+    result = allured_testdir.run_without_allure()
+
+    result.assert_outcomes(passed=1, failed=1)
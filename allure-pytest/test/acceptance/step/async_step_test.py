@@ -0,0 +1,115 @@
+from hamcrest import assert_that, has_entry, has_length
+from allure_commons_test.report import has_test_case
+from allure_commons_test.result import has_step, has_parameter, with_status
+
+
+def test_async_steps(allured_testdir):
+    """
+    >>> import asyncio
+    >>> import allure
+
+    >>> def run(coroutine):
+    ...     loop = asyncio.new_event_loop()
+    ...     try:
+    ...         return loop.run_until_complete(coroutine)
+    ...     finally:
+    ...         loop.close()
+
+    >>> @allure.step("coroutine step {value}")
+    ... async def coroutine_step(value):
+    ...     await asyncio.sleep(0.01)
+    ...     with allure.step("awaited step"):
+    ...         pass
+    ...     return value
+
+    >>> @allure.step
+    ... async def failed_coroutine_step():
+    ...     await asyncio.sleep(0.01)
+    ...     assert False
+
+    >>> @allure.step("async generator step")
+    ... async def async_generator_step(count):
+    ...     for index in range(count):
+    ...         await asyncio.sleep(0.01)
+    ...         with allure.step("yield {}".format(index)):
+    ...             yield index
+
+    >>> def test_coroutine_step_example():
+    ...     assert run(coroutine_step(42)) == 42
+
+    >>> def test_failed_coroutine_step_example():
+    ...     run(failed_coroutine_step())
+
+    >>> def test_async_context_step_example():
+    ...     async def main():
+    ...         async with allure.step("async with step") as step:
+    ...             assert step.title == "async with step"
+    ...             await asyncio.sleep(0.01)
+    ...             with allure.step("awaited step") as awaited:
+    ...                 assert awaited.title == "awaited step"
+    ...     run(main())
+
+    >>> def test_async_generator_step_example():
+    ...     async def main():
+    ...         return [value async for value in async_generator_step(2)]
+    ...     assert run(main()) == [0, 1]
+
+    >>> def test_closed_async_generator_step_example():
+    ...     async def main():
+    ...         values = async_generator_step(3)
+    ...         async for value in values:
+    ...             break
+    ...         await values.aclose()
+    ...         return value
+    ...     assert run(main()) == 0
+    """
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_coroutine_step_example",
+                              has_step("coroutine step 42",
+                                       has_parameter("value", "42"),
+                                       has_step("awaited step")
+                                       )
+                              )
+                )
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_failed_coroutine_step_example",
+                              with_status("failed"),
+                              has_step("failed_coroutine_step",
+                                       with_status("failed")
+                                       )
+                              )
+                )
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_async_context_step_example",
+                              has_step("async with step",
+                                       has_step("awaited step")
+                                       )
+                              )
+                )
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_async_generator_step_example",
+                              has_entry("steps", has_length(1)),
+                              has_step("async generator step",
+                                       has_step("yield 0"),
+                                       has_step("yield 1")
+                                       )
+                              )
+                )
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_closed_async_generator_step_example",
+                              with_status("passed"),
+                              has_step("async generator step",
+                                       with_status("passed"),
+                                       has_step("yield 0",
+                                                with_status("passed")
+                                                )
+                                       )
+                              )
+                )
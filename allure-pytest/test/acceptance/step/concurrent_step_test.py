@@ -0,0 +1,58 @@
+from hamcrest import assert_that, has_entry, has_length
+from allure_commons_test.report import has_test_case
+from allure_commons_test.result import has_step
+
+
+def has_single_step(name, *matchers):
+    return has_step(name, has_entry("steps", has_length(1)), *matchers)
+
+
+def test_concurrent_steps(allured_testdir, monkeypatch):
+    """
+    >>> import asyncio
+    >>> import threading
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> import allure
+
+    >>> async def task(name):
+    ...     with allure.step(name):
+    ...         await asyncio.sleep(0.01)
+    ...         with allure.step(name + " nested"):
+    ...             await asyncio.sleep(0.01)
+
+    >>> def work(name, barrier):
+    ...     with allure.step(name):
+    ...         barrier.wait()
+    ...         with allure.step(name + " nested"):
+    ...             barrier.wait()
+
+    >>> def test_asyncio_gather_steps_example():
+    ...     async def main():
+    ...         with allure.step("gather"):
+    ...             await asyncio.gather(task("first"), task("second"))
+    ...     loop = asyncio.new_event_loop()
+    ...     loop.run_until_complete(main())
+    ...     loop.close()
+
+    >>> def test_thread_pool_steps_example():
+    ...     barrier = threading.Barrier(2)
+    ...     with allure.step("pool"):
+    ...         with ThreadPoolExecutor(max_workers=2) as executor:
+    ...             list(executor.map(work, ["first", "second"], [barrier, barrier]))
+    """
+    monkeypatch.setattr("allure_commons._context.CONTEXT_TRACKING", True)
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    for test_case, parent in (("test_asyncio_gather_steps_example", "gather"),
+                              ("test_thread_pool_steps_example", "pool")):
+        assert_that(allured_testdir.allure_report,
+                    has_test_case(test_case,
+                                  has_entry("steps", has_length(1)),
+                                  has_step(parent,
+                                           has_entry("steps", has_length(2)),
+                                           has_single_step("first", has_step("first nested")),
+                                           has_single_step("second", has_step("second nested"))
+                                           )
+                                  )
+                    )
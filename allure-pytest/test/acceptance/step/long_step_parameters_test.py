@@ -0,0 +1,54 @@
+from hamcrest import assert_that
+from allure_commons_test.report import has_test_case
+from allure_commons_test.result import has_step
+from allure_commons_test.result import has_parameter
+
+
+def test_long_step_parameters(allured_testdir, monkeypatch):
+    """
+    >>> import allure
+
+    >>> @allure.step("step {0}")
+    ... def step(items, text=None):
+    ...     pass
+
+    >>> def test_long_step_parameters_example():
+    ...     step(list(range(100000)), text="a" * 100)
+    """
+    monkeypatch.setattr("allure_commons.utils.MAX_PARAMETER_LENGTH", 20)
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_long_step_parameters_example",
+                              has_step("step [0, 1, 2, 3, 4, 5...",
+                                       has_parameter("items", "[0, 1, 2, 3, 4, 5..."),
+                                       has_parameter("text", "'aaaaaaaaaaaaaaaa...")
+                                       )
+                              )
+                )
+
+
+def test_step_parameters_mutated_after_step(allured_testdir):
+    """
+    >>> import allure
+
+    >>> @allure.step("step {0}")
+    ... def step(items):
+    ...     pass
+
+    >>> def test_step_parameters_mutated_after_step_example():
+    ...     items = [1, 2]
+    ...     step(items)
+    ...     items.append(3)
+    """
+    allured_testdir.parse_docstring_source()
+    allured_testdir.run_with_allure()
+
+    assert_that(allured_testdir.allure_report,
+                has_test_case("test_step_parameters_mutated_after_step_example",
+                              has_step("step [1, 2]",
+                                       has_parameter("items", "[1, 2]")
+                                       )
+                              )
+                )
@@ -9,20 +9,26 @@ from allure_commons.logger import AllureMemoryLogger
 
 
 @contextmanager
-def fake_logger(path, logger):
-    blocked_plugins = []
+def blocked_plugins():
+    blocked = []
     for name, plugin in allure_commons.plugin_manager.list_name_plugin():
         allure_commons.plugin_manager.unregister(plugin=plugin, name=name)
-        blocked_plugins.append(plugin)
+        blocked.append(plugin)
 
-    with mock.patch(path) as ReporterMock:
-        ReporterMock.return_value = logger
-        yield
+    yield
 
-    for plugin in blocked_plugins:
+    for plugin in blocked:
         allure_commons.plugin_manager.register(plugin)
 
 
+@contextmanager
+def fake_logger(path, logger):
+    with blocked_plugins():
+        with mock.patch(path) as ReporterMock:
+            ReporterMock.return_value = logger
+            yield
+
+
 class AlluredTestdir(object):
     def __init__(self, testdir, request):
         self.testdir = testdir
@@ -64,6 +70,10 @@ class AlluredTestdir(object):
 
         return self.allure_report
 
+    def run_without_allure(self, *args, **kwargs):
+        with blocked_plugins():
+            return self.testdir.runpytest(*args, **kwargs)
+
 
 @pytest.fixture
 def allured_testdir(testdir, request):
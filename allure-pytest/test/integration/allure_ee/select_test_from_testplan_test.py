@@ -43,6 +43,12 @@ from hamcrest import assert_that, contains_inanyorder, ends_with
             ["test_number_two"]
         ),
 
+        # by ids and selectors of different tests
+        (
+            [{"id": "1"}, {"selector": "test_without_number"}, {"id": 4}],
+            ["test_number_one", "test_number_three", "test_without_number"]
+        ),
+
         # by wrong selector
         (
             [{"selector": "test_without_never"}],
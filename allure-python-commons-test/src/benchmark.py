@@ -0,0 +1,123 @@
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+TOLERANCE = 0.25
+
+
+def measure(func, repeat=5, number=None):
+    """
+    Returns the best time of a single ``func()`` call in seconds.
+
+    >>> measure(lambda: None, repeat=1, number=10) >= 0
+    True
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_benchmarks(benchmarks, stream=sys.stdout, baseline=None, tolerance=TOLERANCE, **kwargs):
+    """
+    Measures every ``(name, func)`` pair and prints a line per benchmark, compared with ``baseline``
+    results when they are given.
+    """
+    results = {}
+    for name, func in benchmarks:
+        results[name] = measure(func, **kwargs)
+        print(format_result(name, results[name], (baseline or {}).get(name), tolerance), file=stream)
+    return results
+
+
+def format_result(name, time, baseline=None, tolerance=TOLERANCE):
+    """
+    >>> format_result('step', 0.000002)
+    'step                                                      2.000 us'
+
+    >>> format_result('step', 0.000003, baseline=0.000002)
+    'step                                                      3.000 us  x1.50 of 2.000 us  SLOWER'
+    """
+    line = '{name:<50} {time:>12.3f} us'.format(name=name, time=time * 1e6)
+    if baseline:
+        ratio = time / baseline
+        line += '  x{ratio:.2f} of {baseline:.3f} us'.format(ratio=ratio, baseline=baseline * 1e6)
+        if is_regression(time, baseline, tolerance):
+            line += '  SLOWER'
+    return line
+
+
+def is_regression(time, baseline, tolerance=TOLERANCE):
+    """
+    >>> is_regression(1.2, 1.0), is_regression(1.3, 1.0), is_regression(1.0, None)
+    (False, True, False)
+    """
+    return bool(baseline) and time > baseline * (1 + tolerance)
+
+
+def baseline_path(script):
+    """
+    Baselines are kept in ``baselines`` next to the benchmark script.
+
+    >>> baseline_path('/src/benchmark/step_benchmark.py')
+    '/src/benchmark/baselines/step_benchmark.json'
+    """
+    directory, name = os.path.split(os.path.abspath(script))
+    return os.path.join(directory, 'baselines', os.path.splitext(name)[0] + '.json')
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as baseline_file:
+        return json.load(baseline_file)['results']
+
+
+def save_baseline(path, results):
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    data = {'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'results': results}
+    with open(path, 'w') as baseline_file:
+        json.dump(data, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write('\n')
+
+
+def main(benchmarks, script, argv=None, **kwargs):
+    """
+    Runs benchmarks of ``script`` and compares them with its stored baseline. ``--save`` stores the results
+    as the new baseline. Exits with status 1 when a benchmark is slower than the baseline by more than the
+    tolerance, otherwise returns the results.
+    """
+    parser = argparse.ArgumentParser(description='Run {name}'.format(name=os.path.basename(script)))
+    parser.add_argument('--save', action='store_true', help='store results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed slowdown against the baseline, 0.25 by default')
+    parser.add_argument('-k', dest='keyword', default=None, help='run only benchmarks with the keyword in the name')
+    options = parser.parse_args(argv)
+
+    if options.keyword:
+        benchmarks = ((name, func) for name, func in benchmarks if options.keyword in name)
+
+    path = baseline_path(script)
+    baseline = {} if options.save else load_baseline(path)
+    results = run_benchmarks(benchmarks, baseline=baseline, tolerance=options.tolerance, **kwargs)
+
+    if options.save:
+        save_baseline(path, dict(load_baseline(path), **results))
+        print('baseline saved to {path}'.format(path=path))
+        return results
+
+    slower = [name for name, time in results.items() if is_regression(time, baseline.get(name), options.tolerance)]
+    if slower:
+        names = ', '.join(sorted(slower))
+        print('{count} benchmarks are slower than the baseline: {names}'.format(count=len(slower), names=names))
+        sys.exit(1)
+    return results
@@ -66,8 +66,10 @@ Expected: ...
 
 """
 
+import io
 import sys
 import os
+import gzip
 import json
 import fnmatch
 from hamcrest import all_of, any_of
@@ -81,6 +83,11 @@ from hamcrest.core.base_matcher import BaseMatcher
 if sys.version_info[0] < 3:
     from io import open
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 
 class AllureReport(object):
     def __init__(self, result):
@@ -93,9 +100,19 @@ class AllureReport(object):
     def _report_items(report_dir, glob):
         for _file in os.listdir(report_dir):
             if fnmatch.fnmatch(_file, glob):
+                if _file.endswith(('.gz', '.zst')):
+                    yield io.StringIO(AllureReport._decompress(os.path.join(report_dir, _file)).decode('utf-8'))
+                    continue
                 with open(os.path.join(report_dir, _file), encoding="utf-8") as report_file:
                     yield report_file
 
+    @staticmethod
+    def _decompress(path):
+        with open(path, 'rb') as raw:
+            if path.endswith('.gz'):
+                return gzip.GzipFile(fileobj=raw).read()
+            return zstandard.ZstdDecompressor().stream_reader(raw).read()
+
 
 def has_test_case(name, *matchers):
     return has_property('test_cases',
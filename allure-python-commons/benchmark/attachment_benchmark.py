@@ -0,0 +1,67 @@
+"""
+Measures how AllureFileLogger writes attachments: many small ones, a large one
+reported as data and as a file with the copy and hardlink strategies, with
+deduplication and with gzip compression.
+
+    $ python benchmark/attachment_benchmark.py
+"""
+
+import os
+import shutil
+import tempfile
+
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import ATTACHMENT_PATTERN
+from allure_commons.utils import fast_uuid
+from allure_commons_test.benchmark import main
+
+SMALL = 1024
+LARGE = 10 * 1024 * 1024
+
+
+def file_name(ext='txt'):
+    return ATTACHMENT_PATTERN.format(prefix=fast_uuid(), ext=ext)
+
+
+def attach_data(logger, body, count=1):
+    for _ in range(count):
+        logger.report_attached_data(body=body, file_name=file_name())
+
+
+def attach_file(logger, source):
+    logger.report_attached_file(source=source, file_name=file_name())
+
+
+def benchmarks(directory):
+    small = os.urandom(SMALL // 2).hex().encode()
+    large = os.urandom(LARGE // 2).hex().encode()
+    source = os.path.join(directory, 'source.txt')
+    with open(source, 'wb') as source_file:
+        source_file.write(large)
+
+    def logger(name, **kwargs):
+        return AllureFileLogger(os.path.join(directory, name), **kwargs)
+
+    plain = logger('plain', deduplicate=False, attach_strategy='copy')
+    yield '1000 x 1 KiB data', lambda: attach_data(plain, small, 1000)
+    yield '10 MiB data', lambda: attach_data(plain, large)
+    yield '10 MiB file copy', lambda: attach_file(plain, source)
+
+    hardlink = logger('hardlink', deduplicate=False, attach_strategy='hardlink')
+    yield '10 MiB file hardlink', lambda: attach_file(hardlink, source)
+
+    deduplicated = logger('deduplicated', deduplicate=True)
+    yield '1000 x 1 KiB data deduplicated', lambda: attach_data(deduplicated, small, 1000)
+    yield '10 MiB data deduplicated', lambda: attach_data(deduplicated, large)
+
+    compressed = logger('compressed', deduplicate=False, compression='gzip', compress_threshold=SMALL)
+    yield '1000 x 1 KiB data gzip', lambda: attach_data(compressed, small, 1000)
+    yield '10 MiB data gzip', lambda: attach_data(compressed, large)
+
+
+if __name__ == '__main__':
+    directory = tempfile.mkdtemp()
+    try:
+        main(benchmarks(directory), __file__, repeat=3, number=1)
+    finally:
+        shutil.rmtree(directory)
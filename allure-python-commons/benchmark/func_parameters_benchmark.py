@@ -0,0 +1,43 @@
+"""
+Measures func_parameters, which runs on every call of a function decorated
+with @allure.step and of allure fixtures.
+
+    $ python benchmark/func_parameters_benchmark.py
+"""
+
+from allure_commons.utils import func_parameters
+from allure_commons_test.benchmark import main
+
+
+def no_args():
+    pass
+
+
+def positional(a, b, c):
+    pass
+
+
+def defaults(a, b=2, c=3, d=4):
+    pass
+
+
+def everything(a, b=2, *args, **kwargs):
+    pass
+
+
+class Page(object):
+    def click(self, locator, timeout=10):
+        pass
+
+
+def benchmarks():
+    page = Page()
+    yield 'no args', lambda: func_parameters(no_args)
+    yield 'positional', lambda: func_parameters(positional, 1, 2, 3)
+    yield 'defaults', lambda: func_parameters(defaults, 1, d=5)
+    yield 'varargs and kwargs', lambda: func_parameters(everything, 1, 2, 3, 4, x=5, y=6)
+    yield 'method', lambda: func_parameters(Page.click, page, '#submit')
+
+
+if __name__ == '__main__':
+    main(benchmarks(), __file__)
@@ -0,0 +1,102 @@
+"""
+Replays the AllureLifecycle calls allure-robotframework makes for a suite of
+100k keywords. Finished tests stay in the lifecycle until their suite ends,
+as they do in the Robot Framework listener. Another run keeps many nested
+suite containers open while the tests run. Both run with and without context
+tracking.
+
+    $ python benchmark/lifecycle_benchmark.py
+"""
+
+from allure_commons.lifecycle import AllureLifecycle
+from allure_commons.model2 import Status
+from allure_commons.types import AttachmentType
+from allure_commons.utils import uuid4
+from allure_commons_test.benchmark import main
+
+KEYWORDS = 100000
+
+
+def keyword(lifecycle, name, depth, messages):
+    with lifecycle.start_step() as step:
+        step.name = name
+    if depth:
+        keyword(lifecycle, name + '.sub', depth - 1, messages)
+    for index in range(messages):
+        with lifecycle.start_step() as step:
+            step.name = 'message {}'.format(index)
+        lifecycle.stop_step()
+    with lifecycle.update_step() as step:
+        step.status = Status.PASSED
+    lifecycle.stop_step()
+
+
+def run_suite(tests, depth=2, messages=1, context_tracking=False):
+    lifecycle = AllureLifecycle(context_tracking=context_tracking)
+    keywords_per_test = KEYWORDS // tests // (depth + 1)
+
+    with lifecycle.start_container():
+        pass
+    with lifecycle.start_before_fixture() as fixture:
+        fixture.name = 'Suite Setup'
+    lifecycle.stop_before_fixture()
+
+    for test_index in range(tests):
+        with lifecycle.start_container():
+            pass
+        uuid = uuid4()
+        with lifecycle.schedule_test_case(uuid=uuid) as test_result:
+            test_result.name = 'test {}'.format(test_index)
+        for container in lifecycle.containers():
+            container.children.append(uuid)
+
+        for index in range(keywords_per_test):
+            keyword(lifecycle, 'keyword {}'.format(index), depth, messages)
+        lifecycle.attach_data(uuid4(), 'log', name='Keyword Log', attachment_type=AttachmentType.HTML)
+
+        with lifecycle.update_test_case() as test_result:
+            test_result.status = Status.PASSED
+        with lifecycle.schedule_test_case():
+            pass
+        lifecycle.write_container()
+
+    with lifecycle.update_container() as container:
+        for uuid in container.children:
+            lifecycle.write_test_case(uuid)
+    lifecycle.write_container()
+
+
+def run_open_containers(containers, tests=1000, context_tracking=False):
+    lifecycle = AllureLifecycle(context_tracking=context_tracking)
+    for _ in range(containers):
+        with lifecycle.start_container():
+            pass
+
+    for test_index in range(tests):
+        uuid = uuid4()
+        with lifecycle.schedule_test_case(uuid=uuid) as test_result:
+            test_result.name = 'test {}'.format(test_index)
+        keyword(lifecycle, 'keyword', 2, 1)
+        with lifecycle.update_test_case() as test_result:
+            test_result.status = Status.PASSED
+        lifecycle.write_test_case(uuid)
+
+    for _ in range(containers):
+        lifecycle.write_container()
+
+
+def benchmarks():
+    for tests in (10, 1000, 10000):
+        name = '{keywords} keywords tests={tests}'.format(keywords=KEYWORDS, tests=tests)
+        yield name, lambda tests=tests: run_suite(tests)
+    for containers in (10, 1000):
+        name = '1000 tests open containers={containers}'.format(containers=containers)
+        yield name, lambda containers=containers: run_open_containers(containers)
+    for tests in (10, 10000):
+        name = '{keywords} keywords tests={tests} context'.format(keywords=KEYWORDS, tests=tests)
+        yield name, lambda tests=tests: run_suite(tests, context_tracking=True)
+    yield '1000 tests open containers=1000 context', lambda: run_open_containers(1000, context_tracking=True)
+
+
+if __name__ == '__main__':
+    main(benchmarks(), __file__, repeat=3, number=1)
@@ -0,0 +1,51 @@
+"""
+Measures AllureReporter bookkeeping for tests with 10k steps while many fixture
+containers stay open, as session-scoped fixtures do, with and without context
+tracking.
+
+    $ python benchmark/reporter_benchmark.py
+"""
+
+from allure_commons.reporter import AllureReporter
+from allure_commons.model2 import TestResult, TestResultContainer, TestStepResult, Label
+from allure_commons.types import AttachmentType
+from allure_commons_test.benchmark import main
+
+STEPS = 10000
+
+
+def run_test(open_groups, depth, context_tracking=False):
+    reporter = AllureReporter(context_tracking=context_tracking)
+    # fixture containers are started by allure-pytest after the test is scheduled
+    reporter.schedule_test('test', TestResult(uuid='test'))
+    for index in range(open_groups):
+        reporter.start_group('group-{}'.format(index), TestResultContainer(uuid='group-{}'.format(index)))
+    opened = []
+    for index in range(STEPS):
+        uuid = 'step-{}'.format(index)
+        reporter.start_step(None, uuid, TestStepResult(name=uuid))
+        opened.append(uuid)
+        reporter.attach_data(uuid + '-attachment', b'data', name='data', attachment_type=AttachmentType.TEXT)
+        reporter.get_test(None).labels.append(Label(name='tag', value=uuid))
+        if len(opened) == depth:
+            while opened:
+                reporter.stop_step(opened.pop(), stop=index)
+    while opened:
+        reporter.stop_step(opened.pop(), stop=STEPS)
+    reporter.close_test('test')
+
+
+def benchmarks():
+    for open_groups in (0, 100, 1000):
+        for depth in (1, 100):
+            name = '{steps} steps groups={groups} depth={depth}'.format(steps=STEPS, groups=open_groups, depth=depth)
+            yield name, lambda open_groups=open_groups, depth=depth: run_test(open_groups, depth)
+    for open_groups in (0, 1000):
+        for depth in (1, 100):
+            name = '{steps} steps groups={groups} depth={depth} context'.format(
+                steps=STEPS, groups=open_groups, depth=depth)
+            yield name, lambda open_groups=open_groups, depth=depth: run_test(open_groups, depth, True)
+
+
+if __name__ == '__main__':
+    main(benchmarks(), __file__, repeat=3, number=1)
@@ -0,0 +1,58 @@
+"""
+Compares ``attr.asdict`` with the precompiled serializers on deep step trees
+and measures installed JSON backends.
+
+    $ python benchmark/serializer_benchmark.py
+"""
+
+from attr import asdict
+from allure_commons.model2 import TestResult, TestStepResult, Parameter, Label, Attachment, StatusDetails
+from allure_commons.model2 import Status
+from allure_commons.serializer import serialize, get_json_backend, JSON_BACKENDS
+from allure_commons_test.benchmark import main
+
+
+def step_tree(depth, width):
+    steps = []
+    if depth:
+        for index in range(width):
+            steps.append(TestStepResult(name='step {}'.format(index),
+                                        status=Status.PASSED,
+                                        start=1, stop=2,
+                                        parameters=[Parameter(name='index', value=str(index))],
+                                        attachments=[Attachment(name='log', source='log.txt', type='text/plain')],
+                                        steps=step_tree(depth - 1, width)))
+    return steps
+
+
+def test_result(depth, width):
+    return TestResult(name='test', uuid='uuid', fullName='module#test', historyId='id',
+                      status=Status.FAILED, statusDetails=StatusDetails(message='message', trace='trace'),
+                      labels=[Label(name='tag', value=str(index)) for index in range(10)],
+                      steps=step_tree(depth, width), start=1, stop=2)
+
+
+def attr_asdict(item):
+    return asdict(item, filter=lambda attr, value: not (type(value) is not bool and not bool(value)))
+
+
+def benchmarks():
+    for depth, width in ((1, 10), (3, 10), (10, 2)):
+        result = test_result(depth, width)
+        assert attr_asdict(result) == serialize(result)
+        name = 'depth={depth} width={width}'.format(depth=depth, width=width)
+        yield 'attr.asdict {name}'.format(name=name), lambda result=result: attr_asdict(result)
+        yield 'serialize {name}'.format(name=name), lambda result=result: serialize(result)
+
+    data = serialize(test_result(3, 10))
+    for backend in JSON_BACKENDS:
+        dumps = get_json_backend(backend)
+        yield 'dumps {backend}'.format(backend=backend), lambda dumps=dumps: dumps(data)
+
+
+if __name__ == '__main__':
+    results = main(benchmarks(), __file__)
+    for name in sorted(results):
+        if name.startswith('serialize'):
+            baseline = results[name.replace('serialize', 'attr.asdict')]
+            print('speedup {name}: {ratio:.1f}x'.format(name=name.split(' ', 1)[1], ratio=baseline / results[name]))
@@ -0,0 +1,107 @@
+"""
+Measures a step-heavy test body and deep trees of nested steps with no Allure
+plugins, with the plugins allure-pytest registers without --alluredir and with
+a listener that reports the steps.
+
+    $ python benchmark/step_benchmark.py
+"""
+
+import allure
+import allure_commons
+from allure_commons.model2 import TestResult, TestStepResult, Parameter, Label
+from allure_commons.reporter import AllureReporter
+from allure_commons.utils import now, uuid4
+from allure_commons_test.benchmark import main
+
+STEPS = 1000
+DEPTH = 100
+
+
+class DecoratorHelper(object):
+
+    @allure_commons.hookimpl
+    def decorate_as_title(self, test_title):
+        return lambda func: func
+
+
+class StepListener(object):
+
+    def __init__(self):
+        self.reporter = AllureReporter()
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        parameters = [Parameter(name=name, value=value) for name, value in params.items()]
+        self.reporter.start_step(None, uuid, TestStepResult(name=title, start=now(), parameters=parameters))
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        self.reporter.stop_step(uuid, stop=now())
+
+    @allure_commons.hookimpl
+    def attach_data(self, body, name, attachment_type, extension):
+        pass
+
+    @allure_commons.hookimpl
+    def add_label(self, label_type, labels):
+        test_result = self.reporter.get_test(None)
+        test_result.labels.extend(Label(name=label_type, value=label) for label in labels)
+
+
+@allure.step("open {url}")
+def open_page(url, timeout=10):
+    return url
+
+
+@allure.step
+def check(response, expected):
+    return response == expected
+
+
+def test_body():
+    allure.dynamic.label('owner', 'me')
+    for index in range(STEPS):
+        with allure.step('request {}'.format(index)):
+            check(open_page('/page/{}'.format(index)), '/page')
+            allure.attach('response', name='response')
+
+
+@allure.step("level {0}")
+def nested(depth):
+    if depth:
+        nested(depth - 1)
+    else:
+        allure.attach('leaf', name='leaf')
+
+
+def deep_body():
+    for _ in range(STEPS // DEPTH):
+        nested(DEPTH)
+
+
+def run(plugins, body=test_body):
+    for plugin in plugins:
+        allure_commons.plugin_manager.register(plugin)
+    listener = next((plugin for plugin in plugins if isinstance(plugin, StepListener)), None)
+    try:
+        if listener:
+            uuid = uuid4()
+            listener.reporter.schedule_test(uuid, TestResult(uuid=uuid))
+        body()
+        if listener:
+            listener.reporter.drop_test(uuid)
+    finally:
+        for plugin in plugins:
+            allure_commons.plugin_manager.unregister(plugin)
+
+
+def benchmarks():
+    yield 'no plugins', lambda: run([])
+    yield 'decorator helpers', lambda: run([DecoratorHelper()])
+    yield 'reporting listener', lambda: run([DecoratorHelper(), StepListener()])
+    yield 'no plugins depth={}'.format(DEPTH), lambda: run([], deep_body)
+    yield 'reporting listener depth={}'.format(DEPTH), lambda: run([DecoratorHelper(), StepListener()], deep_body)
+
+
+if __name__ == '__main__':
+    main(benchmarks(), __file__, repeat=3, number=10)
@@ -1,10 +1,12 @@
 from functools import wraps
+from inspect import iscoroutinefunction, isasyncgenfunction
 from typing import Any, Callable, TypeVar
 
-from allure_commons._core import plugin_manager
+from allure_commons._core import plugin_manager, reporting_enabled
 from allure_commons.types import LabelType, LinkType
-from allure_commons.utils import uuid4
-from allure_commons.utils import func_parameters, represent
+from allure_commons.attachments import shared_body
+from allure_commons.utils import fast_uuid
+from allure_commons.utils import func_parameters, func_positional_parameters
 
 _TFunc = TypeVar("_TFunc", bound=Callable[..., Any])
 
@@ -86,19 +88,23 @@ class Dynamic(object):
 
     @staticmethod
     def title(test_title):
-        plugin_manager.hook.add_title(test_title=test_title)
+        if reporting_enabled():
+            plugin_manager.hook.add_title(test_title=test_title)
 
     @staticmethod
     def description(test_description):
-        plugin_manager.hook.add_description(test_description=test_description)
+        if reporting_enabled():
+            plugin_manager.hook.add_description(test_description=test_description)
 
     @staticmethod
     def description_html(test_description_html):
-        plugin_manager.hook.add_description_html(test_description_html=test_description_html)
+        if reporting_enabled():
+            plugin_manager.hook.add_description_html(test_description_html=test_description_html)
 
     @staticmethod
     def label(label_type, *labels):
-        plugin_manager.hook.add_label(label_type=label_type, labels=labels)
+        if reporting_enabled():
+            plugin_manager.hook.add_label(label_type=label_type, labels=labels)
 
     @staticmethod
     def severity(severity_level):
@@ -118,7 +124,8 @@ class Dynamic(object):
 
     @staticmethod
     def link(url, link_type=LinkType.LINK, name=None):
-        plugin_manager.hook.add_link(url=url, link_type=link_type, name=name)
+        if reporting_enabled():
+            plugin_manager.hook.add_link(url=url, link_type=link_type, name=name)
 
     @staticmethod
     def issue(url, name=None):
@@ -153,33 +160,93 @@ class StepContext:
     def __init__(self, title, params):
         self.title = title
         self.params = params
-        self.uuid = uuid4()
+        self.uuid = None
+        self._started = False
 
     def __enter__(self):
-        plugin_manager.hook.start_step(uuid=self.uuid, title=self.title, params=self.params)
+        self._started = reporting_enabled()
+        if self._started:
+            if self.uuid is None:
+                self.uuid = fast_uuid()
+            plugin_manager.hook.start_step(uuid=self.uuid, title=self.title, params=self.params)
+        return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        plugin_manager.hook.stop_step(uuid=self.uuid, title=self.title, exc_type=exc_type, exc_val=exc_val,
-                                      exc_tb=exc_tb)
+        if self._started:
+            if exc_type is GeneratorExit:
+                # a generator running the step was closed before it was exhausted, the step did not fail
+                exc_type, exc_val, exc_tb = None, None, None
+            plugin_manager.hook.stop_step(uuid=self.uuid, title=self.title, exc_type=exc_type, exc_val=exc_val,
+                                          exc_tb=exc_tb)
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.__exit__(exc_type, exc_val, exc_tb)
+
+    def _step(self, func, a, kw):
+        if not reporting_enabled():
+            return StepContext(self.title, {})
+        params = func_parameters(func, *a, **kw)
+        args = func_positional_parameters(func, a, params)
+        return StepContext(self.title.format(*args, **params), params)
 
     def __call__(self, func: _TFunc) -> _TFunc:
-        @wraps(func)
-        def impl(*a, **kw):
-            __tracebackhide__ = True
-            params = func_parameters(func, *a, **kw)
-            args = list(map(lambda x: represent(x), a))
-            with StepContext(self.title.format(*args, **params), params):
-                return func(*a, **kw)
+        # the step of a coroutine or an async generator lasts until it is finished, not until it is created
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def impl(*a, **kw):
+                __tracebackhide__ = True
+                if not reporting_enabled():
+                    return await func(*a, **kw)
+                with self._step(func, a, kw):
+                    return await func(*a, **kw)
+        elif isasyncgenfunction(func):
+            @wraps(func)
+            async def impl(*a, **kw):
+                __tracebackhide__ = True
+                with self._step(func, a, kw):
+                    agen = func(*a, **kw)
+                    value, error = None, None
+                    try:
+                        while True:
+                            try:
+                                item = await (agen.athrow(error) if error is not None else agen.asend(value))
+                            except StopAsyncIteration:
+                                break
+                            value, error = None, None
+                            try:
+                                value = yield item
+                            except GeneratorExit:
+                                raise
+                            except BaseException as e:
+                                error = e
+                    finally:
+                        await agen.aclose()
+        else:
+            @wraps(func)
+            def impl(*a, **kw):
+                __tracebackhide__ = True
+                if not reporting_enabled():
+                    return func(*a, **kw)
+                with self._step(func, a, kw):
+                    return func(*a, **kw)
         return impl
 
 
 class Attach(object):
 
     def __call__(self, body, name=None, attachment_type=None, extension=None):
-        plugin_manager.hook.attach_data(body=body, name=name, attachment_type=attachment_type, extension=extension)
+        if reporting_enabled():
+            hook = plugin_manager.hook.attach_data
+            hook(body=shared_body(body, len(hook.get_hookimpls())), name=name, attachment_type=attachment_type,
+                 extension=extension)
 
     def file(self, source, name=None, attachment_type=None, extension=None):
-        plugin_manager.hook.attach_file(source=source, name=name, attachment_type=attachment_type, extension=extension)
+        if reporting_enabled():
+            plugin_manager.hook.attach_file(source=source, name=name, attachment_type=attachment_type,
+                                            extension=extension)
 
 
 attach = Attach()
@@ -190,10 +257,12 @@ class fixture(object):
         self._fixture_function = fixture_function
         self._parent_uuid = parent_uuid
         self._name = name if name else fixture_function.__name__
-        self._uuid = uuid4()
+        self._uuid = fast_uuid()
         self.parameters = None
 
     def __call__(self, *args, **kwargs):
+        if not reporting_enabled():
+            return self._fixture_function(*args, **kwargs)
         self.parameters = func_parameters(self._fixture_function, *args, **kwargs)
 
         with self:
@@ -217,11 +286,13 @@ class fixture(object):
 class test(object):
     def __init__(self, _test, context):
         self._test = _test
-        self._uuid = uuid4()
+        self._uuid = fast_uuid()
         self.context = context
         self.parameters = None
 
     def __call__(self, *args, **kwargs):
+        if not reporting_enabled():
+            return self._test(*args, **kwargs)
         self.parameters = func_parameters(self._test, *args, **kwargs)
 
         with self:
@@ -0,0 +1,197 @@
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from six.moves import _thread
+
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
+CONTEXT_TRACKING = bool(os.environ.get("ALLURE_CONTEXT_TRACKING"))
+
+
+class ContextStacks(object):
+    """
+    Stacks of uuids by key, e.g. by item type, of items started in the current thread or asyncio
+    task. A task starts with the stacks of the code that created it, so steps of concurrent tasks
+    nest under the step that gathered them and not under each other. A thread starts empty.
+
+    Every stack is a linked list of ``(uuid, next)`` cells shared with the contexts it was copied
+    to, so a push does not copy stacks. Items that are no longer alive are dropped from the top
+    of a stack when it is looked up or when an item is stopped.
+
+    >>> alive = {'test', 'step'}
+    >>> stacks = ContextStacks()
+    >>> stacks.push('test', ('all', 'test'))
+    >>> stacks.push('step', ('all', 'step'))
+    >>> stacks.last('all', alive.__contains__), stacks.last('test', alive.__contains__)
+    ('step', 'test')
+
+    >>> alive.remove('step')
+    >>> stacks.trim(('all', 'step'), alive.__contains__)
+    >>> stacks.last('all', alive.__contains__), stacks.last('step', alive.__contains__)
+    ('test', None)
+    """
+
+    def __init__(self):
+        if ContextVar is not None:
+            self._var = ContextVar('allure_items_{id}'.format(id=id(self)), default=None)
+        else:
+            self._local = threading.local()
+
+    def _get(self):
+        if ContextVar is not None:
+            return self._var.get() or {}
+        return getattr(self._local, 'stacks', {})
+
+    def _set(self, stacks):
+        # a new mapping every time: contexts copied into tasks share the old one
+        if ContextVar is not None:
+            self._var.set(stacks)
+        else:
+            self._local.stacks = stacks
+
+    def push(self, uuid, keys):
+        stacks = self._get()
+        pushed = dict(stacks)
+        for key in keys:
+            pushed[key] = (uuid, stacks.get(key))
+        self._set(pushed)
+
+    def last(self, key, is_alive):
+        stacks = self._get()
+        top = cell = stacks.get(key)
+        while cell is not None and not is_alive(cell[0]):
+            cell = cell[1]
+        if cell is not top:
+            trimmed = dict(stacks)
+            trimmed[key] = cell
+            self._set(trimmed)
+        return cell[0] if cell is not None else None
+
+    def trim(self, keys, is_alive):
+        stacks = self._get()
+        trimmed = None
+        for key in keys:
+            top = cell = stacks.get(key)
+            while cell is not None and not is_alive(cell[0]):
+                cell = cell[1]
+            if cell is not top:
+                trimmed = trimmed or dict(stacks)
+                trimmed[key] = cell
+        if trimmed is not None:
+            self._set(trimmed)
+
+
+class ItemStacks(object):
+    """
+    Started and not yet stopped items by uuid, in the order they were started. The last item of
+    a class is found on a stack of uuids kept for every class of the item, and for None, any item.
+    Stopped items are dropped lazily, when they show up on top of a stack.
+
+    >>> from allure_commons.model2 import ExecutableItem, TestResult, TestStepResult
+    >>> stacks = ItemStacks()
+    >>> stacks.push('test', TestResult())
+    >>> stacks.push('step', TestStepResult())
+    >>> stacks.last(ExecutableItem), stacks.last(TestResult), stacks.last()
+    ('step', 'test', 'step')
+
+    >>> _ = stacks.pop('step')
+    >>> stacks.last(ExecutableItem), stacks.last(TestStepResult)
+    ('test', None)
+
+    With context tracking the items started in the current thread or asyncio task are looked up
+    first. When it started none, the last item started by the thread that created the stacks or
+    by the current thread is taken, but not one started by other worker threads.
+    """
+
+    def __init__(self, context_tracking=None):
+        self.items = OrderedDict()
+        self.lock = threading.RLock()
+        self._stacks = defaultdict(list)
+        context_tracking = CONTEXT_TRACKING if context_tracking is None else context_tracking
+        self._context = ContextStacks() if context_tracking else None
+        self._threads = {}
+        self._thread = _thread.get_ident()
+
+    @staticmethod
+    def _keys(item):
+        return (None,) + type(item).__mro__
+
+    def get(self, uuid):
+        return self.items.get(uuid)
+
+    def push(self, uuid, item):
+        with self.lock:
+            if uuid in self.items:
+                # the key keeps its place in the OrderedDict
+                self.items[uuid] = item
+                self._rebuild()
+                return
+
+            self.items[uuid] = item
+            for key in self._keys(item):
+                self._stacks[key].append(uuid)
+            if len(self._stacks[None]) > 2 * len(self.items) + 32:
+                self._rebuild()
+            if self._context is not None:
+                self._threads[uuid] = _thread.get_ident()
+        if self._context is not None:
+            self._context.push(uuid, self._keys(item))
+
+    def pop(self, uuid, *default):
+        with self.lock:
+            item = self.items.pop(uuid, *default)
+            self._threads.pop(uuid, None)
+        if self._context is not None and item is not None:
+            self._context.trim(self._keys(item), self.items.__contains__)
+        return item
+
+    def _rebuild(self):
+        self._stacks = defaultdict(list)
+        for uuid, item in self.items.items():
+            for key in self._keys(item):
+                self._stacks[key].append(uuid)
+
+    def last(self, key=None):
+        """
+        Returns the uuid of the last started item that is an instance of ``key``.
+        """
+        items = self.items
+        if self._context is not None:
+            uuid = self._context.last(key, items.__contains__)
+            return uuid if uuid is not None else self._last_thread_uuid(key)
+
+        stack = self._stacks[key]
+        while stack:
+            uuid = stack[-1]
+            if uuid in items:
+                return uuid
+            stack.pop()
+
+    def _last_thread_uuid(self, key):
+        items = self.items
+        threads = self._thread, _thread.get_ident()
+        with self.lock:
+            stack = self._stacks[key]
+            while stack and stack[-1] not in items:
+                stack.pop()
+            for uuid in reversed(stack):
+                if uuid in items and self._threads.get(uuid) in threads:
+                    return uuid
+
+    def started(self, key):
+        """
+        Returns uuids of the items that are instances of ``key`` in the order they were started.
+        """
+        with self.lock:
+            stack = self._stacks[key]
+            alive, seen = [], set()
+            for uuid in reversed(stack):
+                if uuid not in seen and uuid in self.items:
+                    alive.append(uuid)
+                    seen.add(uuid)
+            alive.reverse()
+            stack[:] = alive
+            return alive
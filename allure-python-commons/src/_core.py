@@ -1,23 +1,67 @@
 import threading
+import weakref
 from six import with_metaclass
 from pluggy import PluginManager
 from allure_commons import _hooks
+from allure_commons import _context
+
+# Hooks called while tests run. decorate_* hooks are called when tests are defined and report_* hooks by listeners.
+_RUNTIME_HOOKS = frozenset(name for spec in (_hooks.AllureUserHooks, _hooks.AllureDeveloperHooks) for name in vars(spec)
+                           if not name.startswith(('_', 'decorate_', 'report_')))
+
+_reporting_managers = weakref.WeakSet()
+
+
+def reporting_enabled():
+    """
+    False when no plugin of any thread implements runtime hooks, e.g. allure-pytest runs without --alluredir.
+    Then steps, attachments and dynamic data have nowhere to go and are skipped right away.
+    """
+    return bool(_reporting_managers)
+
+
+class AllurePluginManager(PluginManager):
+
+    def register(self, plugin, name=None):
+        result = super(AllurePluginManager, self).register(plugin, name=name)
+        self._update_reporting()
+        return result
+
+    def unregister(self, plugin=None, name=None):
+        result = super(AllurePluginManager, self).unregister(plugin=plugin, name=name)
+        self._update_reporting()
+        return result
+
+    def _update_reporting(self):
+        if any(getattr(self.hook, name).get_hookimpls() for name in _RUNTIME_HOOKS):
+            _reporting_managers.add(self)
+        else:
+            _reporting_managers.discard(self)
 
 
 class MetaPluginManager(type):
     _storage = threading.local()
+    _main_plugin_manager = None
 
     @staticmethod
     def get_plugin_manager():
         if not hasattr(MetaPluginManager._storage, 'plugin_manager'):
-            MetaPluginManager._storage.plugin_manager = PluginManager('allure')
+            MetaPluginManager._storage.plugin_manager = AllurePluginManager('allure')
             MetaPluginManager._storage.plugin_manager.add_hookspecs(_hooks.AllureUserHooks)
             MetaPluginManager._storage.plugin_manager.add_hookspecs(_hooks.AllureDeveloperHooks)
+            if threading.current_thread() is threading.main_thread():
+                MetaPluginManager._main_plugin_manager = MetaPluginManager._storage.plugin_manager
 
         return MetaPluginManager._storage.plugin_manager
 
     def __getattr__(cls, attr):
         pm = MetaPluginManager.get_plugin_manager()
+        # with context tracking, threads started by tests have no plugins of their own and report to the main
+        # thread ones
+        if attr == 'hook' and _context.CONTEXT_TRACKING:
+            main_pm = MetaPluginManager._main_plugin_manager
+            if main_pm is not None and pm is not main_pm and not pm.get_plugins():
+                pm = main_pm
         return getattr(pm, attr)
 
 
@@ -56,7 +56,7 @@ class AllureUserHooks(object):
 
     @hookspec
     def attach_data(self, body, name, attachment_type, extension):
-        """ attach data """
+        """ attach data: str, bytes, memoryview, readable stream or iterator of chunks """
 
     @hookspec
     def attach_file(self, source, name, attachment_type, extension):
@@ -0,0 +1,476 @@
+"""
+Writing attachments into the results directory.
+
+Attached files are placed by a strategy, ``copy`` is the default. ``hardlink``,
+``reflink`` and ``symlink`` cost almost nothing for large files when the filesystem
+allows it and fall back to a copy otherwise, e.g. when the source and the results
+directory are on different filesystems. Note that a hardlinked or symlinked
+attachment changes together with its source. ``move`` takes the file away from the test.
+
+Attachment bodies are ``str``, ``bytes``, ``bytearray``, ``memoryview``, readable
+binary or text streams and iterators of such chunks. Streams and iterators are
+written chunk by chunk and can be read only once, so when more than one plugin
+reports attachments, ``shared_body`` reads them into memory for all of them.
+
+>>> import io
+>>> list(attachment_chunks(u'text'))
+[b'text']
+
+>>> list(attachment_chunks(io.BytesIO(b'abc'), chunk_size=2))
+[b'ab', b'c']
+
+>>> list(attachment_chunks(io.StringIO(u'abc'), chunk_size=2))
+[b'ab', b'c']
+
+>>> list(attachment_chunks(chunk for chunk in (u'a', b'b', bytearray(b'c'))))
+[b'a', b'b', bytearray(b'c')]
+
+>>> is_streamed(b'data'), is_streamed(memoryview(b'data')), is_streamed(io.BytesIO(b'data'))
+(False, True, True)
+
+>>> shared_body(io.BytesIO(b'data'), readers=2), shared_body(iter([u'a', b'b']), readers=2)
+(b'data', b'ab')
+
+>>> check_body({'key': 'value'})
+Traceback (most recent call last):
+   ...
+TypeError: Attachment body must be str, bytes, a readable stream or an iterator of chunks, not dict
+
+>>> sorted(ATTACH_STRATEGIES)
+['copy', 'hardlink', 'move', 'reflink', 'symlink']
+
+>>> get_attach_strategy('copy') is copy
+True
+
+>>> get_attach_strategy('teleport')
+Traceback (most recent call last):
+   ...
+ValueError: Unknown attach strategy 'teleport'
+
+Large text attachments may be stored compressed with one of ``COMPRESSIONS``:
+gzip or zstd when zstandard is installed. Results refer to a compressed attachment
+by its name with the compression suffix and to its type with the structured syntax
+suffix of the encoding. Allure CLI does not read such attachments, restore them with
+``decompress_attachment`` and ``restore_attachment`` before generating a report.
+
+>>> get_compression('gzip').suffix, get_compression('gzip').type_suffix
+('.gz', '+gzip')
+
+>>> attachment = {'source': '1-attachment.txt.gz', 'type': 'text/plain+gzip'}
+>>> restore_attachment(attachment), attachment
+(True, {'source': '1-attachment.txt', 'type': 'text/plain'})
+
+>>> is_compressible('1-attachment.txt'), is_compressible('1-attachment.png')
+(True, False)
+
+>>> get_compression('rar')
+Traceback (most recent call last):
+   ...
+ValueError: Compression 'rar' is not installed
+
+``AttachmentBudget`` caps attachment sizes per attachment, per test and per run.
+An oversized attachment keeps its head and tail around a truncation marker and
+fits the limit together with the marker, which is cut too when the limit is
+smaller than the marker.
+
+>>> budget = AttachmentBudget(per_attachment=150, per_test=300)
+>>> trimmed = budget.fit_data(u'a' * 200 + u'b' * 200, 'log', test_uuid='1')
+>>> len(trimmed), trimmed[:3], trimmed[-3:]
+(133, 'aaa', 'bbb')
+
+>>> b''.join(budget.fit_data(io.BytesIO(b'x' * 10), 'small', test_uuid='1'))
+b'xxxxxxxxxx'
+
+>>> len(b''.join(budget.fit_data(io.BytesIO(b'x' * 1000), 'stream', test_uuid='1')))
+133
+
+>>> budget.summary()  # doctest: +NORMALIZE_WHITESPACE
+['2 attachments of 1.4 KiB trimmed to 266.0 B',
+ '  stream: 1000.0 B -> 133.0 B',
+ '  log: 400.0 B -> 133.0 B']
+
+>>> len(budget.fit_data(b'z' * 1000, 'last', test_uuid='1')), budget.fit_data(u'z' * 10, 'over', test_uuid='1')
+(24, '')
+"""
+
+import os
+import gzip
+import shutil
+import hashlib
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from six import text_type, binary_type
+
+try:
+    from collections.abc import Iterator
+except ImportError:
+    from collections import Iterator
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CHUNK_SIZE = 64 * 1024
+COPY_RANGE_SIZE = 1 << 30
+
+TRUNCATION_MARKER = u'\n\n... {size} bytes truncated by allure ...\n\n'
+MARKER_RESERVE = len(TRUNCATION_MARKER.format(size=2 ** 64))
+
+# _IOW(0x94, 9, int) from linux/fs.h
+FICLONE = 0x40049409
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source_file:
+        for chunk in iter(lambda: source_file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_single_pass(body):
+    return hasattr(body, 'read') or isinstance(body, Iterator)
+
+
+def is_streamed(body):
+    """
+    Returns True if the body is not a plain string and has to be written as it
+    is read, without keeping it in memory.
+    """
+    return isinstance(body, (bytearray, memoryview)) or _is_single_pass(body)
+
+
+def check_body(body):
+    if not isinstance(body, (text_type, binary_type)) and not is_streamed(body):
+        raise TypeError("Attachment body must be str, bytes, a readable stream or an iterator of chunks, "
+                        "not {type}".format(type=type(body).__name__))
+
+
+def shared_body(body, readers):
+    """
+    Returns a body every one of ``readers`` can read. Streams and iterators are read
+    into memory once when there is more than one reader.
+    """
+    if readers > 1 and _is_single_pass(body):
+        return b''.join(bytes(chunk) for chunk in attachment_chunks(body))
+    return body
+
+
+def attachment_chunks(body, chunk_size=CHUNK_SIZE):
+    """
+    Yields bytes-like chunks of the attachment body, text is encoded to utf-8.
+    """
+    if isinstance(body, text_type):
+        yield body.encode('utf-8')
+    elif isinstance(body, (binary_type, bytearray, memoryview)):
+        yield body
+    elif hasattr(body, 'read'):
+        while True:
+            chunk = body.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk.encode('utf-8') if isinstance(chunk, text_type) else chunk
+    elif isinstance(body, Iterator):
+        for chunk in body:
+            for part in attachment_chunks(chunk, chunk_size):
+                yield part
+    else:
+        check_body(body)
+
+
+def file_chunks(path, chunk_size=CHUNK_SIZE):
+    with open(path, 'rb') as source_file:
+        for chunk in attachment_chunks(source_file, chunk_size):
+            yield chunk
+
+
+def _truncation_marker(size, room):
+    # cut to the room left in the limit, e.g. when the run budget is almost used up
+    return TRUNCATION_MARKER.format(size=size).encode('utf-8')[:room]
+
+
+def _truncate_stream(chunks, limit, account):
+    keep = max(limit - MARKER_RESERVE, 0)
+    head_size, tail_size = keep - keep // 2, keep // 2
+    head, rest, size = 0, bytearray(), 0
+    for chunk in chunks:
+        size += len(chunk)
+        if head < head_size:
+            part = chunk[:head_size - head]
+            head += len(part)
+            chunk = chunk[len(part):]
+            yield part
+        if chunk:
+            rest += chunk
+            if size > limit:
+                del rest[:max(len(rest) - tail_size, 0)]
+
+    kept = head + len(rest)
+    if size > limit:
+        marker = _truncation_marker(size - kept, limit - kept)
+        kept += len(marker)
+        yield marker
+    yield bytes(rest)
+    if account:
+        account(size, kept)
+
+
+def truncate(body, limit, account=None):
+    """
+    Returns the body cut to ``limit`` bytes, keeping head and tail around a truncation
+    marker. Streams are wrapped and cut while they are read. ``account(size, kept)`` is
+    called with the original and resulting size once they are known.
+    """
+    if is_streamed(body):
+        return _truncate_stream(attachment_chunks(body), limit, account)
+
+    text = isinstance(body, text_type)
+    data = body.encode('utf-8') if text else body
+    size = len(data)
+    if size > limit:
+        keep = max(limit - MARKER_RESERVE, 0)
+        tail_size = keep // 2
+        data = data[:keep - tail_size] + _truncation_marker(size - keep, limit - keep) + data[size - tail_size:]
+        body = data.decode('utf-8', 'ignore') if text else data
+    if account:
+        account(size, len(data))
+    return body
+
+
+def _size_setting(name, value):
+    value = os.environ.get(name) if value is None else value
+    return int(value) if value else None
+
+
+def _format_size(size):
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if size < 1024 or unit == 'GiB':
+            return '{size:.1f} {unit}'.format(size=size, unit=unit)
+        size /= 1024.0
+
+
+class AttachmentBudget(object):
+    """
+    Limits are taken from arguments or ``ALLURE_MAX_ATTACHMENT_SIZE``, ``ALLURE_MAX_TEST_ATTACHMENTS_SIZE``
+    and ``ALLURE_MAX_RUN_ATTACHMENTS_SIZE`` environment variables, in bytes. The budget is
+    off when none is set.
+    """
+
+    def __init__(self, per_attachment=None, per_test=None, per_run=None):
+        self.per_attachment = _size_setting("ALLURE_MAX_ATTACHMENT_SIZE", per_attachment)
+        self.per_test = _size_setting("ALLURE_MAX_TEST_ATTACHMENTS_SIZE", per_test)
+        self.per_run = _size_setting("ALLURE_MAX_RUN_ATTACHMENTS_SIZE", per_run)
+        self.trimmed = []
+        self._used = 0
+        self._used_by_test = {}
+
+    def __bool__(self):
+        return any(limit is not None for limit in (self.per_attachment, self.per_test, self.per_run))
+
+    __nonzero__ = __bool__
+
+    def _limit(self, test_uuid):
+        limits = [self.per_attachment]
+        if self.per_test is not None and test_uuid is not None:
+            limits.append(self.per_test - self._used_by_test.get(test_uuid, 0))
+        if self.per_run is not None:
+            limits.append(self.per_run - self._used)
+        return max(min(limit for limit in limits if limit is not None), 0)
+
+    def _account(self, name, test_uuid):
+        def account(size, kept):
+            self._used += kept
+            if test_uuid is not None:
+                self._used_by_test[test_uuid] = self._used_by_test.get(test_uuid, 0) + kept
+            if kept < size:
+                self.trimmed.append((name, size, kept))
+        return account
+
+    def fit_data(self, body, name, test_uuid=None):
+        return truncate(body, self._limit(test_uuid), self._account(name, test_uuid))
+
+    def fit_file(self, source, name, test_uuid=None):
+        """
+        Returns None when the file fits the budget, a truncated stream of it otherwise.
+        """
+        limit = self._limit(test_uuid)
+        account = self._account(name, test_uuid)
+        size = os.path.getsize(source)
+        if size <= limit:
+            account(size, size)
+            return None
+        return truncate(file_chunks(source), limit, account)
+
+    def release(self, test_uuid):
+        self._used_by_test.pop(test_uuid, None)
+
+    def summary(self, top=10):
+        if not self.trimmed:
+            return []
+        size = sum(trimmed[1] for trimmed in self.trimmed)
+        kept = sum(trimmed[2] for trimmed in self.trimmed)
+        lines = ['{count} attachments of {size} trimmed to {kept}'.format(
+            count=len(self.trimmed), size=_format_size(size), kept=_format_size(kept))]
+        for name, size, kept in sorted(self.trimmed, key=lambda trimmed: trimmed[1], reverse=True)[:top]:
+            lines.append('  {name}: {size} -> {kept}'.format(
+                name=name, size=_format_size(size), kept=_format_size(kept)))
+        if len(self.trimmed) > top:
+            lines.append('  and {count} more'.format(count=len(self.trimmed) - top))
+        return lines
+
+
+def copy(source, destination):
+    shutil.copy2(source, destination)
+
+
+def hardlink(source, destination):
+    try:
+        os.link(source, destination)
+    except (OSError, AttributeError):
+        copy(source, destination)
+
+
+def symlink(source, destination):
+    try:
+        os.symlink(os.path.abspath(source), destination)
+    except (OSError, AttributeError, NotImplementedError):
+        copy(source, destination)
+
+
+def move(source, destination):
+    shutil.move(source, destination)
+
+
+def _clone(source_file, destination_file):
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+        return True
+    except (IOError, OSError):
+        return False
+
+
+def _copy_range(source_file, destination_file):
+    copy_file_range = getattr(os, 'copy_file_range', None)
+    if copy_file_range:
+        try:
+            while copy_file_range(source_file.fileno(), destination_file.fileno(), COPY_RANGE_SIZE):
+                pass
+            return
+        except OSError:
+            source_file.seek(0)
+            destination_file.seek(0)
+            destination_file.truncate()
+    shutil.copyfileobj(source_file, destination_file, CHUNK_SIZE)
+
+
+def reflink(source, destination):
+    """
+    Shares data blocks with the source on copy-on-write filesystems (btrfs, xfs),
+    then tries in-kernel ``copy_file_range`` and finally a plain copy.
+    """
+    with open(source, 'rb') as source_file, open(destination, 'wb') as destination_file:
+        if not _clone(source_file, destination_file):
+            _copy_range(source_file, destination_file)
+    shutil.copystat(source, destination)
+
+
+ATTACH_STRATEGIES = OrderedDict([
+    ('copy', copy),
+    ('hardlink', hardlink),
+    ('reflink', reflink),
+    ('symlink', symlink),
+    ('move', move),
+])
+
+
+def get_attach_strategy(name=None):
+    """
+    Returns ``place(source, destination)`` for the strategy ``name``,
+    ``ALLURE_ATTACH_STRATEGY`` environment variable or ``copy``.
+    """
+    name = name or os.environ.get("ALLURE_ATTACH_STRATEGY") or 'copy'
+    if name not in ATTACH_STRATEGIES:
+        raise ValueError("Unknown attach strategy '{name}'".format(name=name))
+    return ATTACH_STRATEGIES[name]
+
+
+Compression = namedtuple('Compression', ['suffix', 'type_suffix', 'writer', 'reader'])
+
+COMPRESSIONS = OrderedDict()
+COMPRESSIONS['gzip'] = Compression('.gz', '+gzip',
+                                   lambda raw: gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6),
+                                   lambda raw: gzip.GzipFile(fileobj=raw, mode='rb'))
+if zstandard:
+    COMPRESSIONS['zstd'] = Compression('.zst', '+zstd',
+                                       lambda raw: zstandard.ZstdCompressor().stream_writer(raw),
+                                       lambda raw: zstandard.ZstdDecompressor().stream_reader(raw))
+
+COMPRESSIBLE_EXTENSIONS = frozenset(['attach', 'txt', 'log', 'csv', 'tsv', 'uri', 'html', 'xml', 'json', 'yaml', 'svg'])
+COMPRESS_THRESHOLD = 1024 * 1024
+
+
+def get_compression(name):
+    if name not in COMPRESSIONS:
+        raise ValueError("Compression '{name}' is not installed".format(name=name))
+    return COMPRESSIONS[name]
+
+
+def is_compressible(file_name):
+    return os.path.splitext(file_name)[1][1:].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+@contextmanager
+def open_attachment(path, compression=None):
+    """
+    Opens ``path`` for writing, through the compression when it is given.
+    """
+    with open(path, 'wb') as raw:
+        if compression is None:
+            yield raw
+            return
+        compressed = compression.writer(raw)
+        try:
+            yield compressed
+        finally:
+            compressed.close()
+
+
+def decompress_attachment(path):
+    """
+    Restores the original attachment from a compressed ``path`` and removes it.
+    Returns the restored path or None if ``path`` is not compressed.
+    """
+    for compression in COMPRESSIONS.values():
+        if path.endswith(compression.suffix):
+            destination = path[:-len(compression.suffix)]
+            with open(path, 'rb') as raw, open(destination, 'wb') as decompressed:
+                reader = compression.reader(raw)
+                shutil.copyfileobj(reader, decompressed, CHUNK_SIZE)
+                reader.close()
+            os.unlink(path)
+            return destination
+    return None
+
+
+def restore_attachment(attachment):
+    """
+    Points a serialized ``attachment`` that refers to a compressed file at the restored one.
+    Returns True if the attachment was changed.
+    """
+    source = attachment.get('source') or ''
+    for compression in COMPRESSIONS.values():
+        if source.endswith(compression.suffix):
+            attachment['source'] = source[:-len(compression.suffix)]
+            mime_type = attachment.get('type')
+            if mime_type and mime_type.endswith(compression.type_suffix):
+                attachment['type'] = mime_type[:-len(compression.type_suffix)]
+            return True
+    return False
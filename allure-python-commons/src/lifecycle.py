@@ -1,6 +1,6 @@
-from collections import OrderedDict
 from contextlib import contextmanager
 from allure_commons._core import plugin_manager
+from allure_commons._context import ItemStacks
 from allure_commons.model2 import TestResultContainer
 from allure_commons.model2 import TestResult
 from allure_commons.model2 import Attachment, ATTACHMENT_PATTERN
@@ -8,36 +8,31 @@ from allure_commons.model2 import TestStepResult
 from allure_commons.model2 import ExecutableItem
 from allure_commons.model2 import TestBeforeResult
 from allure_commons.model2 import TestAfterResult
-from allure_commons.utils import uuid4
+from allure_commons.utils import uuid4, fast_uuid
 from allure_commons.utils import now
 from allure_commons.types import AttachmentType
+from allure_commons.attachments import AttachmentBudget, check_body, shared_body
 
 
 class AllureLifecycle(object):
-    def __init__(self):
-        self._items = OrderedDict()
+    def __init__(self, context_tracking=None):
+        self._stacks = ItemStacks(context_tracking)
+        self._items = self._stacks.items
+        self.attachment_budget = AttachmentBudget()
 
     def _get_item(self, uuid=None, item_type=None):
-        uuid = uuid or self._last_item_uuid(item_type=item_type)
+        uuid = uuid or self._stacks.last(item_type)
         return self._items.get(uuid)
 
     def _pop_item(self, uuid=None, item_type=None):
-        uuid = uuid or self._last_item_uuid(item_type=item_type)
-        return self._items.pop(uuid, None)
-
-    def _last_item_uuid(self, item_type=None):
-        for uuid in reversed(self._items):
-            item = self._items.get(uuid)
-            if item_type is None:
-                return uuid
-            elif type(item) == item_type or isinstance(item, item_type):
-                return uuid
+        uuid = uuid or self._stacks.last(item_type)
+        return self._stacks.pop(uuid, None)
 
     @contextmanager
     def schedule_test_case(self, uuid=None):
         test_result = TestResult()
         test_result.uuid = uuid or uuid4()
-        self._items[test_result.uuid] = test_result
+        self._stacks.push(test_result.uuid, test_result)
         yield test_result
 
     @contextmanager
@@ -47,6 +42,7 @@ class AllureLifecycle(object):
     def write_test_case(self, uuid=None):
         test_result = self._pop_item(uuid=uuid, item_type=TestResult)
         if test_result:
+            self.attachment_budget.release(test_result.uuid)
             plugin_manager.hook.report_result(result=test_result)
 
     @contextmanager
@@ -55,7 +51,7 @@ class AllureLifecycle(object):
         step = TestStepResult()
         step.start = now()
         parent.steps.append(step)
-        self._items[uuid or uuid4()] = step
+        self._stacks.push(uuid or fast_uuid(), step)
         yield step
 
     @contextmanager
@@ -70,13 +66,14 @@ class AllureLifecycle(object):
     @contextmanager
     def start_container(self, uuid=None):
         container = TestResultContainer(uuid=uuid or uuid4())
-        self._items[container.uuid] = container
+        self._stacks.push(container.uuid, container)
         yield container
 
     def containers(self):
-        for item in self._items.values():
-            if type(item) == TestResultContainer:
-                yield item
+        for uuid in self._stacks.started(TestResultContainer):
+            container = self._items.get(uuid)
+            if type(container) == TestResultContainer:
+                yield container
 
     @contextmanager
     def update_container(self, uuid=None):
@@ -93,7 +90,7 @@ class AllureLifecycle(object):
         parent = self._get_item(uuid=parent_uuid, item_type=TestResultContainer)
         if parent:
             parent.befores.append(fixture)
-        self._items[uuid or uuid4()] = fixture
+        self._stacks.push(uuid or fast_uuid(), fixture)
         yield fixture
 
     @contextmanager
@@ -111,7 +108,7 @@ class AllureLifecycle(object):
         parent = self._get_item(uuid=parent_uuid, item_type=TestResultContainer)
         if parent:
             parent.afters.append(fixture)
-        self._items[uuid or uuid4()] = fixture
+        self._stacks.push(uuid or fast_uuid(), fixture)
         yield fixture
 
     @contextmanager
@@ -133,15 +130,33 @@ class AllureLifecycle(object):
 
         file_name = ATTACHMENT_PATTERN.format(prefix=uuid, ext=extension)
         attachment = Attachment(source=file_name, name=name, type=mime_type)
-        uuid = self._last_item_uuid(item_type=ExecutableItem)
+        uuid = self._stacks.last(ExecutableItem)
         self._items[uuid].attachments.append(attachment)
 
         return file_name
 
+    def _budget_test_uuid(self):
+        test_result = self._get_item(item_type=TestResult) if self.attachment_budget.per_test is not None else None
+        return test_result.uuid if test_result else None
+
     def attach_file(self, uuid, source, name=None, attachment_type=None, extension=None):
         file_name = self._attach(uuid, name=name, attachment_type=attachment_type, extension=extension)
+        if self.attachment_budget:
+            body = self.attachment_budget.fit_file(source, name or file_name, self._budget_test_uuid())
+            if body is not None:
+                self._report_attached_data(body, file_name)
+                return
         plugin_manager.hook.report_attached_file(source=source, file_name=file_name)
 
     def attach_data(self, uuid, body, name=None, attachment_type=None, extension=None):
+        check_body(body)
         file_name = self._attach(uuid, name=name, attachment_type=attachment_type, extension=extension)
-        plugin_manager.hook.report_attached_data(body=body, file_name=file_name)
+        if self.attachment_budget:
+            body = self.attachment_budget.fit_data(body, name or file_name, self._budget_test_uuid())
+        self._report_attached_data(body, file_name)
+
+    @staticmethod
+    def _report_attached_data(body, file_name):
+        hook = plugin_manager.hook.report_attached_data
+        # streams can be read only once, with several plugins they are read into memory for all of them
+        hook(body=shared_body(body, len(hook.get_hookimpls())), file_name=file_name)
@@ -1,21 +1,107 @@
 import errno
-import io
 import os
-import sys
-import json
+import logging
 import uuid
-import shutil
+import hashlib
+import atexit
+import itertools
+import threading
 from six import text_type
-from attr import asdict
+from six.moves import queue
 from allure_commons import hookimpl
+from allure_commons.serializer import serialize, get_json_backend
+from allure_commons.attachments import get_attach_strategy, file_digest, is_streamed, attachment_chunks
+from allure_commons.attachments import get_compression, is_compressible, open_attachment, COMPRESS_THRESHOLD
+from allure_commons.attachments import truncate, file_chunks, AttachmentBudget
 
 INDENT = 4
+QUEUE_SIZE = 1024
+NDJSON_PATTERN = "{prefix}-results.ndjson"
+
+log = logging.getLogger(__name__)
+
+
+class AsyncWriter(object):
+    """
+    Runs write tasks on background threads. The queue is bounded, so ``submit`` blocks
+    when writers fall behind. Every failed task is logged with the name of its file when
+    it fails, ``flush`` and ``close`` raise an error listing all of them.
+    """
+
+    def __init__(self, workers=1, queue_size=QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._errors = []
+        self._threads = []
+        for index in range(workers):
+            thread = threading.Thread(target=self._drain, name='allure-writer-{}'.format(index))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _drain(self):
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                name, func, args = task
+                func(*args)
+            except Exception as e:
+                log.error("Failed to write allure file %s", name, exc_info=True)
+                self._errors.append((name, e))
+            finally:
+                self._queue.task_done()
+
+    def _raise_errors(self):
+        if self._errors:
+            errors, self._errors = self._errors, []
+            if len(errors) == 1:
+                raise errors[0][1]
+            lines = ["{name}: {error!r}".format(name=name, error=error) for name, error in errors]
+            message = "Failed to write {count} allure files:\n{lines}"
+            raise IOError(message.format(count=len(errors), lines="\n".join(lines)))
+
+    def submit(self, name, func, *args):
+        self._queue.put((name, func, args))
+
+    def flush(self):
+        self._queue.join()
+        self._raise_errors()
+
+    def close(self):
+        threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+        self._raise_errors()
 
 
 class AllureFileLogger(object):
 
-    def __init__(self, report_dir, clean=False):
+    def __init__(self, report_dir, clean=False, writers=None, queue_size=QUEUE_SIZE, json_backend=None, ndjson=None,
+                 deduplicate=None, attach_strategy=None, compression=None, compress_threshold=None,
+                 max_attachment_size=None):
         self._report_dir = report_dir
+        self._writer = None
+        self._dumps = get_json_backend(json_backend)
+        self._place_file = get_attach_strategy(attach_strategy)
+        compression = compression or os.environ.get("ALLURE_COMPRESS_ATTACHMENTS")
+        self._compression = get_compression(compression) if compression else None
+        self._compress_threshold = int(os.environ.get("ALLURE_COMPRESS_THRESHOLD", COMPRESS_THRESHOLD)
+                                       if compress_threshold is None else compress_threshold)
+        # reporters trim attachments to the budget, this guards data reported directly through hooks
+        self._max_attachment_size = AttachmentBudget(per_attachment=max_attachment_size).per_attachment
+        self._ndjson = bool(os.environ.get("ALLURE_NDJSON_OUTPUT")) if ndjson is None else ndjson
+        self._ndjson_name = NDJSON_PATTERN.format(prefix=uuid.uuid4())
+        self._ndjson_file = None
+        self._ndjson_lock = threading.Lock()
+        self._deduplicate = (bool(os.environ.get("ALLURE_DEDUPLICATE_ATTACHMENTS")) if deduplicate is None
+                             else deduplicate)
+        self._stored_attachments = {}
+        self._attachment_aliases = {}
+        self._compressed_attachments = {}
+        self._attachments_lock = threading.Lock()
 
         try:
             os.makedirs(report_dir)
@@ -28,16 +114,82 @@ class AllureFileLogger(object):
                     if os.path.isfile(f):
                         os.unlink(f)
 
+        writers = int(os.environ.get("ALLURE_ASYNC_WRITERS", 0)) if writers is None else writers
+        if writers > 0:
+            self._writer = AsyncWriter(writers, queue_size)
+            atexit.register(self.close)
+
+    def _submit(self, name, func, *args):
+        if self._writer:
+            self._writer.submit(name, func, *args)
+        else:
+            func(*args)
+
+    def flush(self):
+        if self._writer:
+            self._writer.flush()
+
+    def close(self):
+        writer, self._writer = self._writer, None
+        try:
+            if writer:
+                atexit.unregister(self.close)
+                writer.close()
+        finally:
+            with self._ndjson_lock:
+                if self._ndjson_file:
+                    self._ndjson_file.close()
+                    self._ndjson_file = None
+
     def _report_item(self, item):
-        indent = INDENT if os.environ.get("ALLURE_INDENT_OUTPUT") else None
         filename = item.file_pattern.format(prefix=uuid.uuid4())
-        data = asdict(item, filter=lambda attr, value: not (type(value) != bool and not bool(value)))
-        with io.open(os.path.join(self._report_dir, filename), 'w', encoding='utf8') as json_file:
-            if sys.version_info.major < 3:
-                json_file.write(
-                    unicode(json.dumps(data, indent=indent, ensure_ascii=False, encoding='utf8')))  # noqa: F821
-            else:
-                json.dump(data, json_file, indent=indent, ensure_ascii=False)
+        data = serialize(item)
+        if self._attachment_aliases or self._compressed_attachments:
+            self._resolve_attachments(data)
+        self._submit(filename, self._write_item, filename, data)
+
+    def _deduplicated(self, digest, file_name):
+        """
+        Returns True if the same content was already stored, results reported
+        later will refer to the stored file instead of ``file_name``.
+        """
+        key = digest, os.path.splitext(file_name)[1]
+        with self._attachments_lock:
+            stored = self._stored_attachments.setdefault(key, file_name)
+            if stored != file_name:
+                self._attachment_aliases[file_name] = stored
+                return True
+        return False
+
+    def _resolve_attachments(self, data):
+        for attachment in data.get('attachments', ()):
+            source = self._attachment_aliases.pop(attachment['source'], attachment['source'])
+            compression = self._compressed_attachments.get(source)
+            if compression:
+                source += compression.suffix
+                if attachment.get('type'):
+                    attachment['type'] += compression.type_suffix
+            attachment['source'] = source
+        for key in ('steps', 'befores', 'afters'):
+            for child in data.get(key, ()):
+                self._resolve_attachments(child)
+
+    def _write_item(self, filename, data):
+        if self._ndjson:
+            self._append_record(filename, data)
+            return
+
+        indent = INDENT if os.environ.get("ALLURE_INDENT_OUTPUT") else None
+        with open(os.path.join(self._report_dir, filename), 'wb') as json_file:
+            json_file.write(self._dumps(data, indent))
+
+    def _append_record(self, filename, data):
+        line = self._dumps({'file': filename, 'data': data}) + b'\n'
+        with self._ndjson_lock:
+            if self._ndjson_file is None:
+                self._ndjson_file = open(os.path.join(self._report_dir, self._ndjson_name), 'ab')
+            self._ndjson_file.write(line)
+            self._ndjson_file.flush()
 
     @hookimpl
     def report_result(self, result):
@@ -49,17 +201,68 @@ class AllureFileLogger(object):
 
     @hookimpl
     def report_attached_file(self, source, file_name):
-        destination = os.path.join(self._report_dir, file_name)
-        shutil.copy2(source, destination)
+        if self._max_attachment_size is not None and os.path.getsize(source) > self._max_attachment_size:
+            self._write_attached_stream(truncate(file_chunks(source), self._max_attachment_size), file_name)
+            return
+        if self._deduplicate and self._deduplicated(file_digest(source), file_name):
+            return
+        # placed right away: tests may change or remove the source after attaching it
+        self._place_file(source, os.path.join(self._report_dir, file_name))
 
     @hookimpl
     def report_attached_data(self, body, file_name):
-        destination = os.path.join(self._report_dir, file_name)
-        with open(destination, 'wb') as attached_file:
-            if isinstance(body, text_type):
-                attached_file.write(body.encode('utf-8'))
-            else:
-                attached_file.write(body)
+        if self._max_attachment_size is not None:
+            body = truncate(body, self._max_attachment_size)
+        if is_streamed(body):
+            self._write_attached_stream(body, file_name)
+            return
+        if isinstance(body, text_type):
+            body = body.encode('utf-8')
+        if self._deduplicate and self._deduplicated(hashlib.sha256(body).hexdigest(), file_name):
+            return
+        # decided here and not by the writer: results reported after this call must refer to the compressed file
+        compression = self._compression_for(file_name, len(body))
+        if compression:
+            self._compressed_attachments[file_name] = compression
+        self._submit(file_name, self._write_attached_data, body, file_name, compression)
+
+    def _compression_for(self, file_name, size):
+        if self._compression and size >= self._compress_threshold and is_compressible(file_name):
+            return self._compression
+        return None
+
+    def _attachment_path(self, file_name, compression):
+        path = os.path.join(self._report_dir, file_name)
+        return path + compression.suffix if compression else path
+
+    def _write_attached_stream(self, body, file_name):
+        # streams are read right away: the caller may close them or reuse buffers after attach
+        chunks = attachment_chunks(body)
+        head, size = [], 0
+        if self._compression and is_compressible(file_name):
+            # keep up to the threshold in memory to decide whether the stream is worth compressing
+            for chunk in chunks:
+                head.append(bytes(chunk))
+                size += len(head[-1])
+                if size >= self._compress_threshold:
+                    break
+
+        compression = self._compression_for(file_name, size)
+        destination = self._attachment_path(file_name, compression)
+        digest = hashlib.sha256()
+        with open_attachment(destination, compression) as attached_file:
+            for chunk in itertools.chain(head, chunks):
+                attached_file.write(chunk)
+                if self._deduplicate:
+                    digest.update(chunk)
+        if self._deduplicate and self._deduplicated(digest.hexdigest(), file_name):
+            os.unlink(destination)
+        elif compression:
+            self._compressed_attachments[file_name] = compression
+
+    def _write_attached_data(self, body, file_name, compression):
+        with open_attachment(self._attachment_path(file_name, compression), compression) as attached_file:
+            attached_file.write(body)
 
 
 class AllureMemoryLogger(object):
@@ -69,14 +272,20 @@ class AllureMemoryLogger(object):
         self.test_containers = []
         self.attachments = {}
 
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
     @hookimpl
     def report_result(self, result):
-        data = asdict(result, filter=lambda attr, value: not (type(value) != bool and not bool(value)))
+        data = serialize(result)
         self.test_cases.append(data)
 
     @hookimpl
     def report_container(self, container):
-        data = asdict(container, filter=lambda attr, value: not (type(value) != bool and not bool(value)))
+        data = serialize(container)
         self.test_containers.append(data)
 
     @hookimpl
@@ -85,4 +294,4 @@ class AllureMemoryLogger(object):
 
     @hookimpl
     def report_attached_data(self, body, file_name):
-        self.attachments[file_name] = body
+        self.attachments[file_name] = b''.join(attachment_chunks(body)) if is_streamed(body) else body
@@ -0,0 +1,129 @@
+"""
+Time spent in Allure code, by source and by test.
+
+Sources are measured with ``profiler.measure(name)`` and allure hook calls are
+measured automatically once the profiler is attached to a plugin manager.
+Measurements nested in other measurements count for their own source, but
+are not added to the totals twice.
+
+>>> profiler = Profiler()
+>>> profiler.start_test('test')
+>>> with profiler.measure('listener'):
+...     with profiler.measure('serialization'):
+...         pass
+>>> sorted(profiler.stop_test('test'))
+['listener', 'serialization']
+
+>>> profiler.sources['serialization'][0], profiler.tests['test'] == profiler.total
+(1, True)
+
+>>> profiler.summary(top=1)  # doctest: +ELLIPSIS
+['allure overhead: ... ms in 1 tests, ... ms per test', '    listener ... 1 calls']
+"""
+
+import threading
+from collections import defaultdict
+
+from allure_commons.utils import _clock_ns
+
+
+class _Measurement(object):
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = self._profiler._enter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profiler._exit(self._name, self._start)
+
+
+class _NoMeasurement(object):
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+NO_MEASUREMENT = _NoMeasurement()
+
+
+class Profiler(object):
+
+    def __init__(self):
+        # name -> [calls, seconds]
+        self.sources = defaultdict(lambda: [0, 0.0])
+        self.tests = defaultdict(float)
+        self.total = 0.0
+        self._current_test = None
+        self._test_sources = defaultdict(float)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        self._local.depth = getattr(self._local, 'depth', 0) + 1
+        return _clock_ns()
+
+    def _exit(self, name, start):
+        elapsed = (_clock_ns() - start) / 1e9
+        self._local.depth -= 1
+        outermost = not self._local.depth
+        with self._lock:
+            source = self.sources[name]
+            source[0] += 1
+            source[1] += elapsed
+            if self._current_test is not None:
+                self._test_sources[name] += elapsed
+            if outermost:
+                self.total += elapsed
+                if self._current_test is not None:
+                    self.tests[self._current_test] += elapsed
+
+    def measure(self, name):
+        return _Measurement(self, name)
+
+    def start_test(self, test_id):
+        with self._lock:
+            self._current_test = test_id
+            self._test_sources = defaultdict(float)
+
+    def stop_test(self, test_id):
+        """
+        Returns seconds by source spent while the test ran, up to now.
+        """
+        with self._lock:
+            if self._current_test != test_id:
+                return {}
+            self._current_test = None
+            return dict(self._test_sources)
+
+    def attach(self, plugin_manager):
+        """
+        Measures every hook call of ``plugin_manager``, returns a function that stops it.
+        """
+        starts = threading.local()
+
+        def before(hook_name, hook_impls, kwargs):
+            starts.__dict__.setdefault('stack', []).append(self._enter())
+
+        def after(outcome, hook_name, hook_impls, kwargs):
+            self._exit('hook ' + hook_name, starts.stack.pop())
+
+        return plugin_manager.add_hookcall_monitoring(before, after)
+
+    def summary(self, top=10):
+        if not self.sources:
+            return []
+        per_test = self.total / len(self.tests) if self.tests else 0.0
+        lines = ['allure overhead: {total:.1f} ms in {tests} tests, {per_test:.3f} ms per test'.format(
+            total=self.total * 1000, tests=len(self.tests), per_test=per_test * 1000)]
+        sources = sorted(self.sources.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (calls, seconds) in sources[:top]:
+            line = '    {name:<40} {time:>10.1f} ms {calls:>8} calls'
+            lines.append(line.format(name=name, time=seconds * 1000, calls=calls))
+        return lines
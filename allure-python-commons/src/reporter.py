@@ -1,20 +1,35 @@
-from collections import OrderedDict
-
 from allure_commons.types import AttachmentType
 from allure_commons.model2 import ExecutableItem
 from allure_commons.model2 import TestResult
 from allure_commons.model2 import Attachment, ATTACHMENT_PATTERN
 from allure_commons.utils import now
+from allure_commons.attachments import AttachmentBudget, check_body, shared_body
 from allure_commons._core import plugin_manager
+from allure_commons._context import ItemStacks
 
 
 class AllureReporter(object):
-    def __init__(self):
-        self._items = OrderedDict()
+    """
+    >>> from allure_commons.model2 import TestStepResult
+    >>> reporter = AllureReporter()
+    >>> reporter.schedule_test('test', TestResult())
+    >>> reporter.start_step(None, 'step', TestStepResult(name='step'))
+    >>> reporter.get_last_item(ExecutableItem) is None, reporter.get_last_item(TestResult) is reporter.get_test('test')
+    (True, True)
+
+    >>> reporter.start_step(None, 'nested', TestStepResult(name='nested'))
+    >>> [step.name for step in reporter.get_item('step').steps]
+    ['nested']
+    """
+
+    def __init__(self, context_tracking=None):
+        self._stacks = ItemStacks(context_tracking)
+        self._items = self._stacks.items
         self._orphan_items = []
+        self.attachment_budget = AttachmentBudget()
 
     def _update_item(self, uuid, **kwargs):
-        item = self._items[uuid] if uuid else self._items[next(reversed(self._items))]
+        item = self._items[uuid] if uuid else self._items[self._stacks.last()]
         for name, value in kwargs.items():
             attr = getattr(item, name)
             if isinstance(attr, list):
@@ -23,26 +38,28 @@ class AllureReporter(object):
                 setattr(item, name, value)
 
     def _last_executable(self):
-        for _uuid in reversed(self._items):
-            if isinstance(self._items[_uuid], ExecutableItem):
-                return _uuid
+        return self._stacks.last(ExecutableItem)
 
     def get_item(self, uuid):
         return self._items.get(uuid)
 
     def get_last_item(self, item_type=None):
-        for _uuid in reversed(self._items):
-            if item_type is None:
-                return self._items.get(_uuid)
-            if type(self._items[_uuid]) == item_type:
-                return self._items.get(_uuid)
+        item = self._items.get(self._stacks.last(item_type))
+        if item_type is None or item is None or type(item) is item_type:
+            return item
+        # the last instance is of a subclass or item_type is a base class, look for the exact type
+        with self._stacks.lock:
+            items = list(self._items.values())
+        for item in reversed(items):
+            if type(item) is item_type:
+                return item
 
     def start_group(self, uuid, group):
-        self._items[uuid] = group
+        self._stacks.push(uuid, group)
 
     def stop_group(self, uuid, **kwargs):
         self._update_item(uuid, **kwargs)
-        group = self._items.pop(uuid)
+        group = self._stacks.pop(uuid)
         plugin_manager.hook.report_container(container=group)
 
     def update_group(self, uuid, **kwargs):
@@ -50,33 +67,35 @@ class AllureReporter(object):
 
     def start_before_fixture(self, parent_uuid, uuid, fixture):
         self._items.get(parent_uuid).befores.append(fixture)
-        self._items[uuid] = fixture
+        self._stacks.push(uuid, fixture)
 
     def stop_before_fixture(self, uuid, **kwargs):
         self._update_item(uuid, **kwargs)
-        self._items.pop(uuid)
+        self._stacks.pop(uuid)
 
     def start_after_fixture(self, parent_uuid, uuid, fixture):
         self._items.get(parent_uuid).afters.append(fixture)
-        self._items[uuid] = fixture
+        self._stacks.push(uuid, fixture)
 
     def stop_after_fixture(self, uuid, **kwargs):
         self._update_item(uuid, **kwargs)
-        fixture = self._items.pop(uuid)
+        fixture = self._stacks.pop(uuid)
         fixture.stop = now()
 
     def schedule_test(self, uuid, test_case):
-        self._items[uuid] = test_case
+        self._stacks.push(uuid, test_case)
 
     def get_test(self, uuid):
         return self.get_item(uuid) if uuid else self.get_last_item(TestResult)
 
     def close_test(self, uuid):
-        test_case = self._items.pop(uuid)
+        test_case = self._stacks.pop(uuid)
+        self.attachment_budget.release(uuid)
         plugin_manager.hook.report_result(result=test_case)
 
     def drop_test(self, uuid):
-        self._items.pop(uuid)
+        self._stacks.pop(uuid)
+        self.attachment_budget.release(uuid)
 
     def start_step(self, parent_uuid, uuid, step):
         parent_uuid = parent_uuid if parent_uuid else self._last_executable()
@@ -84,14 +103,14 @@ class AllureReporter(object):
             self._orphan_items.append(uuid)
         else:
             self._items[parent_uuid].steps.append(step)
-            self._items[uuid] = step
+            self._stacks.push(uuid, step)
 
     def stop_step(self, uuid, **kwargs):
         if uuid in self._orphan_items:
             self._orphan_items.remove(uuid)
         else:
             self._update_item(uuid, **kwargs)
-            self._items.pop(uuid)
+            self._stacks.pop(uuid)
 
     def _attach(self, uuid, name=None, attachment_type=None, extension=None):
         mime_type = attachment_type
@@ -108,10 +127,28 @@ class AllureReporter(object):
 
         return file_name
 
+    def _budget_test_uuid(self):
+        test_case = self.get_last_item(TestResult) if self.attachment_budget.per_test is not None else None
+        return test_case.uuid if test_case else None
+
     def attach_file(self, uuid, source, name=None, attachment_type=None, extension=None):
         file_name = self._attach(uuid, name=name, attachment_type=attachment_type, extension=extension)
+        if self.attachment_budget:
+            body = self.attachment_budget.fit_file(source, name or file_name, self._budget_test_uuid())
+            if body is not None:
+                self._report_attached_data(body, file_name)
+                return
         plugin_manager.hook.report_attached_file(source=source, file_name=file_name)
 
     def attach_data(self, uuid, body, name=None, attachment_type=None, extension=None):
+        check_body(body)
         file_name = self._attach(uuid, name=name, attachment_type=attachment_type, extension=extension)
-        plugin_manager.hook.report_attached_data(body=body, file_name=file_name)
+        if self.attachment_budget:
+            body = self.attachment_budget.fit_data(body, name or file_name, self._budget_test_uuid())
+        self._report_attached_data(body, file_name)
+
+    @staticmethod
+    def _report_attached_data(body, file_name):
+        hook = plugin_manager.hook.report_attached_data
+        # streams can be read only once, with several plugins they are read into memory for all of them
+        hook(body=shared_body(body, len(hook.get_hookimpls())), file_name=file_name)
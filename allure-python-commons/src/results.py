@@ -0,0 +1,135 @@
+"""
+Post-processing of allure results directory.
+
+    $ python -m allure_commons.results explode allure-results
+    $ python -m allure_commons.results decompress allure-results
+"""
+
+from __future__ import print_function
+
+import os
+import json
+import warnings
+import argparse
+from allure_commons.logger import INDENT, NDJSON_PATTERN
+from allure_commons.serializer import get_json_backend
+from allure_commons.attachments import decompress_attachment, restore_attachment
+
+NDJSON_SUFFIX = NDJSON_PATTERN.format(prefix='')
+
+
+def explode(report_dir, indent=None, json_backend=None):
+    """
+    Writes every record of NDJSON result files found in ``report_dir`` to its own
+    ``{uuid}-result.json`` or ``{uuid}-container.json`` file and removes the NDJSON files.
+    Returns the number of written files.
+    """
+    dumps = get_json_backend(json_backend)
+    count = 0
+
+    for name in os.listdir(report_dir):
+        if not name.endswith(NDJSON_SUFFIX):
+            continue
+
+        path = os.path.join(report_dir, name)
+        with open(path, 'rb') as ndjson_file:
+            for number, line in enumerate(ndjson_file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    warnings.warn('Skip broken record {path}:{number}'.format(path=path, number=number))
+                    continue
+                file_name = os.path.basename(record['file'])
+                with open(os.path.join(report_dir, file_name), 'wb') as json_file:
+                    json_file.write(dumps(record['data'], indent))
+                count += 1
+        os.unlink(path)
+
+    return count
+
+
+def _restore_attachments(data):
+    restored = False
+    for attachment in data.get('attachments', ()):
+        restored = restore_attachment(attachment) or restored
+    for key in ('steps', 'befores', 'afters'):
+        for child in data.get(key, ()):
+            restored = _restore_attachments(child) or restored
+    return restored
+
+
+def _restore_results(path, dumps, indent):
+    with open(path, 'rb') as json_file:
+        data = json.loads(json_file.read().decode('utf-8'))
+    if _restore_attachments(data):
+        with open(path, 'wb') as json_file:
+            json_file.write(dumps(data, indent))
+
+
+def _restore_records(path, dumps):
+    with open(path, 'rb') as ndjson_file:
+        lines = ndjson_file.readlines()
+    restored = False
+    for index, line in enumerate(lines):
+        try:
+            record = json.loads(line.decode('utf-8'))
+        except ValueError:
+            continue
+        if _restore_attachments(record['data']):
+            lines[index] = dumps(record) + b'\n'
+            restored = True
+    if restored:
+        with open(path, 'wb') as ndjson_file:
+            ndjson_file.writelines(lines)
+
+
+def decompress(report_dir, indent=None, json_backend=None):
+    """
+    Restores attachments stored compressed in ``report_dir`` and points results at them,
+    so that Allure CLI can read the directory. Returns the number of restored files.
+    """
+    dumps = get_json_backend(json_backend)
+    count = 0
+    for name in os.listdir(report_dir):
+        if '-attachment.' in name and decompress_attachment(os.path.join(report_dir, name)):
+            count += 1
+
+    for name in os.listdir(report_dir):
+        path = os.path.join(report_dir, name)
+        if name.endswith(('-result.json', '-container.json')):
+            _restore_results(path, dumps, indent)
+        elif name.endswith(NDJSON_SUFFIX):
+            _restore_records(path, dumps)
+    return count
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m allure_commons.results',
+                                     description='Allure results directory tools')
+    commands = parser.add_subparsers(dest='command')
+
+    explode_parser = commands.add_parser('explode',
+                                         help='Convert NDJSON results to a file per result and container')
+    explode_parser.add_argument('report_dir', metavar='DIR')
+
+    decompress_parser = commands.add_parser('decompress',
+                                            help='Restore compressed attachments')
+    decompress_parser.add_argument('report_dir', metavar='DIR')
+
+    options = parser.parse_args(args)
+    indent = INDENT if os.environ.get("ALLURE_INDENT_OUTPUT") else None
+
+    if options.command == 'explode':
+        count = explode(options.report_dir, indent=indent)
+        print('{count} files written to {dir}'.format(count=count, dir=options.report_dir))
+    elif options.command == 'decompress':
+        count = decompress(options.report_dir, indent=indent)
+        print('{count} attachments restored in {dir}'.format(count=count, dir=options.report_dir))
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Fast replacement for ``attr.asdict(item, filter=...)`` used to dump model2 objects.
+
+For every attrs class a dedicated function is generated on first use and cached.
+Empty values are dropped exactly like the original filter did: everything falsy
+except booleans.
+
+Encoding to JSON goes through one of ``JSON_BACKENDS``: orjson or ujson when
+installed, the standard library otherwise. Every backend returns the same bytes
+for result data.
+
+>>> from allure_commons.model2 import TestResult, TestStepResult, Parameter, Label, StatusDetails
+
+>>> serialize(Label(name='severity', value='normal'))
+{'name': 'severity', 'value': 'normal'}
+
+>>> serialize(StatusDetails(flaky=False, message=''))
+{'flaky': False}
+
+>>> from allure_commons.utils import Timestamp
+>>> serialize(TestStepResult(start=Timestamp(1500000000000100000), stop=Timestamp(1500000000000350000)))
+{'start': 1500000000000, 'startMicros': 1500000000000100, 'stop': 1500000000000, 'stopMicros': 1500000000000350}
+
+>>> step = TestStepResult(name='step', parameters=[Parameter(name='a', value='1')], start=0)
+>>> result = TestResult(name='test', uuid='1', steps=[step], labels=(Label(name='tag', value='t'),))
+>>> serialize(result)  # doctest: +NORMALIZE_WHITESPACE
+{'name': 'test',
+ 'steps': [{'name': 'step', 'parameters': [{'name': 'a', 'value': '1'}]}],
+ 'uuid': '1',
+ 'labels': [{'name': 'tag', 'value': 't'}]}
+
+>>> from attr import asdict
+>>> serialize(result) == asdict(result, filter=lambda attr, value: not (type(value) != bool and not bool(value)))
+True
+
+>>> data = serialize(result)
+>>> data['description'] = u'\u043f\u0440\u0438\u0432\u0435\u0442 \x1b /'
+>>> get_json_backend('json')(data)[:30]
+b'{"name":"test","steps":[{"name'
+
+>>> all(get_json_backend(name)(data) == get_json_backend('json')(data) for name in JSON_BACKENDS)
+True
+
+>>> all(get_json_backend(name)(data, 4) == get_json_backend('json')(data, 4) for name in JSON_BACKENDS)
+True
+
+>>> get_json_backend('unknown')
+Traceback (most recent call last):
+   ...
+ValueError: JSON backend 'unknown' is not installed
+"""
+
+import os
+import json
+from collections import OrderedDict
+
+import attr
+from six import text_type, binary_type, integer_types
+
+from allure_commons.utils import Timestamp
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+_ATOMIC = frozenset((text_type, binary_type, float, bool, type(None)) + integer_types)
+_SEQUENCES = (list, tuple, set, frozenset)
+
+_serializers = {}
+
+_FIELD_TEMPLATE = """
+    value = item.{name}
+    if value or value is False:
+        data['{name}'] = value if value.__class__ in atomic else convert(value)"""
+
+_TIME_FIELD_TEMPLATE = _FIELD_TEMPLATE + """
+        if value.__class__ is timestamp:
+            data['{name}Micros'] = value.micros"""
+
+_TIME_FIELDS = ('start', 'stop')
+
+
+def _compile(cls):
+    lines = ["def serialize_{cls}(item):".format(cls=cls.__name__),
+             "    data = {}"]
+    lines.extend((_TIME_FIELD_TEMPLATE if field.name in _TIME_FIELDS else _FIELD_TEMPLATE).format(name=field.name)
+                 for field in attr.fields(cls))
+    lines.append("    return data")
+
+    namespace = {'atomic': _ATOMIC, 'convert': _convert, 'timestamp': Timestamp}
+    exec(compile("\n".join(lines), "<serializer {cls}>".format(cls=cls.__name__), "exec"), namespace)
+    function = namespace["serialize_{cls}".format(cls=cls.__name__)]
+    _serializers[cls] = function
+    return function
+
+
+def _convert(value):
+    cls = value.__class__
+    if cls in _ATOMIC:
+        return value
+
+    function = _serializers.get(cls)
+    if function is not None:
+        return function(value)
+    if attr.has(cls):
+        return _compile(cls)(value)
+    if cls is Timestamp:
+        return int(value)
+    if isinstance(value, _SEQUENCES):
+        return [_convert(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _convert(item) for key, item in value.items()}
+    return value
+
+
+def serialize(item):
+    function = _serializers.get(item.__class__) or _compile(item.__class__)
+    return function(item)
+
+
+def _json_dumps(data, indent=None):
+    separators = None if indent else (',', ':')
+    text = json.dumps(data, indent=indent, ensure_ascii=False, separators=separators)
+    return text.encode('utf-8') if isinstance(text, text_type) else text
+
+
+def _ujson_dumps(data, indent=None):
+    return ujson.dumps(data, indent=indent or 0, ensure_ascii=False, escape_forward_slashes=False).encode('utf-8')
+
+
+def _orjson_dumps(data, indent=None):
+    # orjson can indent only by two spaces
+    if indent:
+        return _ujson_dumps(data, indent) if ujson else _json_dumps(data, indent)
+    return orjson.dumps(data)
+
+
+JSON_BACKENDS = OrderedDict()
+if orjson:
+    JSON_BACKENDS['orjson'] = _orjson_dumps
+if ujson:
+    JSON_BACKENDS['ujson'] = _ujson_dumps
+JSON_BACKENDS['json'] = _json_dumps
+
+
+def get_json_backend(name=None):
+    """
+    Returns ``dumps(data, indent=None) -> bytes`` for the backend ``name``, ``ALLURE_JSON_BACKEND``
+    environment variable or the fastest installed one. Data a fast backend can not encode
+    (e.g. huge integers) is passed to the standard library.
+    """
+    name = name or os.environ.get("ALLURE_JSON_BACKEND") or 'auto'
+    if name == 'auto':
+        name = next(iter(JSON_BACKENDS))
+    if name not in JSON_BACKENDS:
+        raise ValueError("JSON backend '{name}' is not installed".format(name=name))
+
+    dumps = JSON_BACKENDS[name]
+    if dumps is _json_dumps:
+        return dumps
+
+    def safe_dumps(data, indent=None):
+        try:
+            return dumps(data, indent)
+        except (TypeError, ValueError, OverflowError):
+            return _json_dumps(data, indent)
+
+    return safe_dumps
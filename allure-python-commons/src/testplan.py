@@ -0,0 +1,103 @@
+"""
+Test plans list tests to run by allure id or by full name selector. A plan is
+indexed once, so adapters check every collected test in constant time.
+
+>>> plan = TestPlan([{'id': 1}, {'id': '2', 'selector': 'module#test'}, {'selector': 'module#other'}])
+>>> plan.contains_id('1'), plan.contains_id(2), plan.contains_id(3), plan.contains_id(None)
+(True, True, False, False)
+
+>>> plan.contains_selector('module#other'), plan.contains_selector('module#test_other')
+(True, False)
+
+>>> len(plan), bool(TestPlan())
+(3, False)
+
+Plans are read from ``ALLURE_TESTPLAN_PATH`` and parsed again only when the
+file changes. Huge plans are parsed as a stream when ijson is installed.
+
+>>> import tempfile
+>>> with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as plan_file:
+...     _ = plan_file.write('{"version": "1.0", "tests": [{"id": 1, "selector": "module#test"}]}')
+>>> plan = load_testplan(plan_file.name)
+>>> plan.contains_id(1), load_testplan(plan_file.name) is plan
+(True, True)
+
+>>> load_testplan(None)
+<TestPlan of 0 tests>
+>>> os.unlink(plan_file.name)
+"""
+
+import os
+import json
+import threading
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+class TestPlan(object):
+    __test__ = False
+
+    def __init__(self, tests=()):
+        self._ids = set()
+        self._selectors = set()
+        self._size = 0
+        for test in tests:
+            self._add(test)
+
+    def _add(self, test):
+        self._size += 1
+        test_id = test.get("id")
+        if test_id is not None:
+            self._ids.add(str(test_id))
+        selector = test.get("selector")
+        if selector is not None:
+            self._selectors.add(selector)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return '<TestPlan of {size} tests>'.format(size=self._size)
+
+    def contains_id(self, test_id):
+        return test_id is not None and str(test_id) in self._ids
+
+    def contains_selector(self, selector):
+        return selector in self._selectors
+
+
+def _read_tests(path):
+    with open(path, 'rb') as plan_file:
+        if ijson is not None:
+            for test in ijson.items(plan_file, 'tests.item'):
+                yield test
+        else:
+            for test in json.loads(plan_file.read().decode('utf-8')).get("tests", []):
+                yield test
+
+
+_testplans = {}
+_testplans_lock = threading.Lock()
+
+
+def load_testplan(path=None):
+    """
+    Returns the plan at ``path`` or ``ALLURE_TESTPLAN_PATH``, an empty plan when neither is set.
+    """
+    path = path or os.environ.get("ALLURE_TESTPLAN_PATH")
+    if not path:
+        return TestPlan()
+
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    version = stat.st_mtime, stat.st_size
+    with _testplans_lock:
+        cached = _testplans.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        plan = TestPlan(_read_tests(path))
+        _testplans[path] = version, plan
+        return plan
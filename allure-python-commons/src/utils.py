@@ -9,12 +9,16 @@ import json
 import socket
 import inspect
 import hashlib
+import itertools
+import weakref
 import platform
 import threading
 import traceback
 import collections
 
 from functools import partial
+from allure_commons.model2 import Label
+from allure_commons.types import LabelType
 
 
 def getargspec(func):
@@ -81,8 +85,76 @@ def uuid4():
     return str(uuid.uuid4())
 
 
+def _new_id_sequence():
+    global _id_prefix, _id_counter
+    # random part of a version 4 uuid, the last group is a counter
+    _id_prefix = str(uuid.uuid4())[:24]
+    _id_counter = itertools.count()
+
+
+_new_id_sequence()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_new_id_sequence)
+
+
+def fast_uuid():
+    """
+    Cheap replacement of ``uuid4()`` for items started many times per test: steps, fixtures and attachments.
+    Every process takes 74 random bits once and counts in the last 48 bits, so ids stay unique between
+    processes writing to the same results directory and look like version 4 uuids.
+
+    >>> first, second = fast_uuid(), fast_uuid()
+    >>> first[:24] == second[:24], int(second[24:], 16) - int(first[24:], 16)
+    (True, 1)
+
+    >>> uuid.UUID(first).version
+    4
+    """
+    return '%s%012x' % (_id_prefix, next(_id_counter))
+
+
+if hasattr(time, 'perf_counter_ns'):
+    _clock_ns = time.perf_counter_ns
+    _epoch_ns = time.time_ns() - _clock_ns()
+else:
+    def _clock_ns():
+        return int(time.perf_counter() * 1e9)
+
+    _epoch_ns = int(time.time() * 1e9) - _clock_ns()
+
+MICROSECOND_TIMESTAMPS = bool(os.environ.get("ALLURE_MICROSECOND_TIMESTAMPS"))
+
+
+class Timestamp(int):
+    """
+    Milliseconds of ``now()`` that also keep microseconds. Result files get them in extra ``startMicros``
+    and ``stopMicros`` fields.
+
+    >>> timestamp = Timestamp(1500000000123456789)
+    >>> timestamp, timestamp.micros
+    (1500000000123, 1500000000123456)
+    """
+
+    def __new__(cls, ns):
+        timestamp = super(Timestamp, cls).__new__(cls, (ns + 500000) // 1000000)
+        timestamp.micros = ns // 1000
+        return timestamp
+
+
 def now():
-    return int(round(1000 * time.time()))
+    """
+    Milliseconds since the epoch. Time is measured by a monotonic high-resolution clock from a single wall-clock
+    reading per process, so adjustments of the system clock during a run do not distort durations. With
+    ``ALLURE_MICROSECOND_TIMESTAMPS`` environment variable set returns ``Timestamp``.
+
+    >>> start = now()
+    >>> now() >= start, abs(start - int(time.time() * 1000)) < 1000
+    (True, True)
+    """
+    ns = _epoch_ns + _clock_ns()
+    if MICROSECOND_TIMESTAMPS:
+        return Timestamp(ns)
+    return (ns + 500000) // 1000000
 
 
 def platform_label():
@@ -100,6 +172,37 @@ def host_tag():
     return socket.gethostname()
 
 
+_session_labels = {}
+_session_labels_lock = threading.Lock()
+
+
+def session_labels(framework, host=True, thread=True):
+    """
+    Host, thread, framework and language labels, the same for every result of the process or of the thread
+    that asks for them. Results share these Label objects, so they must not be changed.
+
+    >>> session_labels('pytest') is session_labels('pytest')
+    True
+
+    >>> [label.name for label in session_labels('behave', host=False, thread=False)]
+    ['framework', 'language']
+    """
+    key = framework, host_tag() if host else None, thread_tag() if thread else None
+    labels = _session_labels.get(key)
+    if labels is None:
+        _, host_name, thread_name = key
+        labels = []
+        if host_name is not None:
+            labels.append(Label(name=LabelType.HOST, value=host_name))
+        if thread_name is not None:
+            labels.append(Label(name=LabelType.THREAD, value=thread_name))
+        labels.append(Label(name=LabelType.FRAMEWORK, value=framework))
+        labels.append(Label(name=LabelType.LANGUAGE, value=platform_label()))
+        with _session_labels_lock:
+            labels = _session_labels.setdefault(key, tuple(labels))
+    return labels
+
+
 def escape_non_unicode_symbols(item):
     if not (six.PY2 and isinstance(item, str)):
         return item
@@ -170,6 +273,98 @@ def represent(item):
         return repr(item)
 
 
+MAX_PARAMETER_LENGTH = int(os.environ.get("ALLURE_MAX_PARAMETER_LENGTH", 1000))
+# subclasses, e.g. OrderedDict, Counter or namedtuples, are shortened to these builtins
+_SHORTENED_CONTAINERS = (dict, list, tuple, frozenset, set)
+
+
+def represent_parameter(item, max_length=None):
+    """
+    ``represent(item)`` cut to ``max_length`` characters, ``ALLURE_MAX_PARAMETER_LENGTH`` environment variable
+    or 1000 by default, 0 turns the limit off. Long strings and large containers are cut before they are
+    represented, so only the part that is shown gets formatted.
+
+    >>> represent_parameter([1, 2, 3])
+    '[1, 2, 3]'
+
+    >>> represent_parameter('a' * 100, max_length=10)
+    "'aaaaaa..."
+
+    >>> represent_parameter(list(range(10 ** 6)), max_length=20)
+    '[0, 1, 2, 3, 4, 5...'
+
+    >>> represent_parameter(dict.fromkeys(range(10 ** 6), 'value'), max_length=20)
+    "{0: 'value', 1: '..."
+
+    >>> from collections import OrderedDict
+    >>> represent_parameter(OrderedDict.fromkeys(range(10 ** 6), 'value'), max_length=20)
+    "{0: 'value', 1: '..."
+
+    >>> len(represent_parameter('a' * 100, max_length=0))
+    102
+    """
+    if max_length is None:
+        max_length = MAX_PARAMETER_LENGTH
+    if not max_length:
+        return represent(item)
+
+    if isinstance(item, six.text_type):
+        if len(item) > max_length:
+            item = item[:max_length]
+    elif isinstance(item, _SHORTENED_CONTAINERS) and len(item) > max_length // 3:
+        # every item takes at least three characters with the separator, the rest would be cut anyway
+        for container in _SHORTENED_CONTAINERS:
+            if isinstance(item, container):
+                items = item.items() if container is dict else item
+                item = container(itertools.islice(items, max_length // 3 + 1))
+                break
+
+    text = represent(item)
+    return text if len(text) <= max_length else text[:max(max_length - 3, 0)] + '...'
+
+
+class LazyRepresentation(object):
+    """
+    ``represent_parameter(item)`` made when it is needed for the first time, e.g. for step title
+    placeholders that use only some of the arguments. Compares, formats and prints as that string.
+    Never store it in results: the argument may change before the result is reported.
+
+    >>> value = LazyRepresentation([1, 2])
+    >>> value
+    '[1, 2]'
+
+    >>> value == '[1, 2]', '<{}>'.format(value)
+    (True, '<[1, 2]>')
+    """
+
+    __slots__ = ('_item', '_text')
+
+    def __init__(self, item):
+        self._item = item
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = represent_parameter(self._item)
+            self._item = None
+        return self._text
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
+
+    def __eq__(self, other):
+        return str(self) == (str(other) if isinstance(other, LazyRepresentation) else other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(str(self))
+
+
 def func_parameters(func, *args, **kwargs):
     """
     >>> def helper(func):
@@ -211,6 +406,9 @@ def func_parameters(func, *args, **kwargs):
     >>> kwargs(b=4)
     [('a', '1'), ('b', '4')]
 
+    >>> kwargs(3)
+    [('a', '3'), ('b', '2')]
+
     >>> @helper
     ... def args_kwargs(a, b, c=3, d=4):
     ...     pass
@@ -224,6 +422,9 @@ def func_parameters(func, *args, **kwargs):
     >>> args_kwargs(1, 2, 5, 6)
     [('a', '1'), ('b', '2'), ('c', '5'), ('d', '6')]
 
+    >>> args_kwargs(1, 2, 5)
+    [('a', '1'), ('b', '2'), ('c', '5'), ('d', '4')]
+
     >>> @helper
     ... def varargs(*a):
     ...     pass
@@ -302,38 +503,91 @@ def func_parameters(func, *args, **kwargs):
 
     """
     parameters = {}
-    arg_spec = getargspec(func) if six.PY2 else inspect.getfullargspec(func)
-    arg_order = list(arg_spec.args)
-    args_dict = dict(zip(arg_spec.args, args))
-
-    if arg_spec.defaults:
-        kwargs_defaults_dict = dict(zip(arg_spec.args[len(args):], arg_spec.defaults))
-        parameters.update(kwargs_defaults_dict)
+    arg_names, defaults, varargs, first_arg, order = _signature_plan(func)
 
-    if arg_spec.varargs:
-        arg_order.append(arg_spec.varargs)
-        varargs = args[len(arg_spec.args):]
-        parameters.update({arg_spec.varargs: varargs} if varargs else {})
+    if defaults:
+        parameters.update(defaults)
 
-    if arg_spec.args and arg_spec.args[0] in ['cls', 'self']:
-        args_dict.pop(arg_spec.args[0], None)
+    if varargs and len(args) > len(arg_names):
+        parameters[varargs] = args[len(arg_names):]
 
     if kwargs:
-        if sys.version_info < (3, 6):
-            # Sort alphabetically as old python versions does
-            # not preserve call order for kwargs
-            arg_order.extend(sorted(list(kwargs.keys())))
-        else:
-            # Keep py3.6 behaviour to preserve kwargs order
-            arg_order.extend(list(kwargs.keys()))
         parameters.update(kwargs)
 
-    parameters.update(args_dict)
+    parameters.update(zip(arg_names[first_arg:], args[first_arg:]))
+
+    items = collections.OrderedDict()
+    for name in order:
+        if name in parameters:
+            items[name] = represent_parameter(parameters[name])
+    if kwargs:
+        # Old python versions do not preserve call order for kwargs, sort them alphabetically
+        for name in sorted(kwargs) if sys.version_info < (3, 6) else kwargs:
+            if name not in items:
+                items[name] = represent_parameter(kwargs[name])
 
-    items = parameters.iteritems() if six.PY2 else parameters.items()
-    sorted_items = sorted(map(lambda kv: (kv[0], represent(kv[1])), items), key=lambda x: arg_order.index(x[0]))
+    return items
 
-    return collections.OrderedDict(sorted_items)
+
+def func_positional_parameters(func, args, parameters):
+    """
+    Representations of positional ``args`` for step title placeholders, taken from ``parameters`` made by
+    ``func_parameters`` so that no argument is represented twice. Arguments that are not reported, self,
+    cls and varargs, are represented only if a placeholder uses them.
+
+    >>> def method(self, a, *b):
+    ...     pass
+
+    >>> parameters = func_parameters(method, 'self', [1], 2)
+    >>> func_positional_parameters(method, ('self', [1], 2), parameters)
+    ["'self'", '[1]', '2']
+    """
+    arg_names = _signature_plan(func)[0]
+    return [parameters[arg_names[index]] if index < len(arg_names) and arg_names[index] in parameters
+            else LazyRepresentation(arg) for index, arg in enumerate(args)]
+
+
+_signature_plans = weakref.WeakKeyDictionary()
+
+
+def _signature_plan(func):
+    """
+    What func_parameters needs to know about a function, computed once per function: names of positional
+    arguments, defaults of the arguments, name of varargs, number of leading arguments to skip (self or cls)
+    and the order of parameters.
+
+    >>> def method(self, a, b=2, *c, **d):
+    ...     pass
+
+    >>> _signature_plan(method)
+    (('self', 'a', 'b'), {'b': 2}, 'c', 1, ('self', 'a', 'b', 'c'))
+
+    >>> _signature_plan(method) is _signature_plan(method)
+    True
+    """
+    # bound methods are created on every attribute access, their functions live longer
+    key = getattr(func, '__func__', func)
+    try:
+        plan = _signature_plans.get(key)
+    except TypeError:
+        return _make_signature_plan(func)
+    if plan is None:
+        plan = _make_signature_plan(func)
+        try:
+            _signature_plans[key] = plan
+        except TypeError:
+            pass
+    return plan
+
+
+def _make_signature_plan(func):
+    arg_spec = getargspec(func) if six.PY2 else inspect.getfullargspec(func)
+    arg_names = tuple(arg_spec.args)
+    defaults = dict(zip(arg_names[len(arg_names) - len(arg_spec.defaults):], arg_spec.defaults)) \
+        if arg_spec.defaults else {}
+    first_arg = 1 if arg_names and arg_names[0] in ('cls', 'self') else 0
+    order = arg_names + (arg_spec.varargs,) if arg_spec.varargs else arg_names
+    return arg_names, defaults, arg_spec.varargs, first_arg, order
 
 
 def format_traceback(exc_traceback):
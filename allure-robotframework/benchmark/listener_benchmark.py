@@ -0,0 +1,54 @@
+"""
+Runs a generated suite of 1000 tests with 10 keywords each with and without
+the allure_robotframework listener and prints the per-test overhead.
+
+    $ python benchmark/listener_benchmark.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from allure_commons_test.benchmark import main
+
+TESTS = 1000
+KEYWORDS = 10
+
+
+def generate_suite(path):
+    with open(path, 'w') as suite_file:
+        suite_file.write('*** Test Cases ***\n')
+        for index in range(TESTS):
+            suite_file.write('Test {index}\n'.format(index=index))
+            for keyword in range(KEYWORDS):
+                suite_file.write('    Log    message {keyword}\n'.format(keyword=keyword))
+        suite_file.write('\n')
+
+
+def run_robot(suite, *args):
+    command = [sys.executable, '-m', 'robot', '--output', 'NONE', '--log', 'NONE', '--report', 'NONE']
+    command += list(args) + [suite]
+    with open(os.devnull, 'w') as devnull:
+        subprocess.check_call(command, stdout=devnull)
+
+
+def benchmarks(directory):
+    suite = os.path.join(directory, 'suite.robot')
+    generate_suite(suite)
+    listener = 'allure_robotframework;{path}'.format(path=os.path.join(directory, 'allure-results'))
+
+    yield 'without listener', lambda: run_robot(suite)
+    yield 'with listener', lambda: run_robot(suite, '--listener', listener)
+
+
+if __name__ == '__main__':
+    directory = tempfile.mkdtemp()
+    try:
+        results = main(benchmarks(directory), __file__, repeat=3, number=1)
+    finally:
+        shutil.rmtree(directory)
+    if 'without listener' in results and 'with listener' in results:
+        overhead = (results['with listener'] - results['without listener']) / TESTS
+        print('overhead per test: {time:.1f} us'.format(time=overhead * 1e6))
@@ -5,10 +5,10 @@ from robot.libraries.BuiltIn import BuiltIn
 
 import allure_commons
 from allure_commons.utils import now
-from allure_commons.utils import uuid4
+from allure_commons.utils import uuid4, fast_uuid
 from allure_commons.utils import md5
-from allure_commons.utils import platform_label
 from allure_commons.utils import host_tag
+from allure_commons.utils import session_labels
 from allure_commons.utils import format_exception, format_traceback
 from allure_commons.model2 import Label, Link
 from allure_commons.model2 import Status, StatusDetails
@@ -58,8 +58,9 @@ MAX_STEP_MESSAGE_COUNT = int(os.getenv('ALLURE_MAX_STEP_MESSAGE_COUNT', 0))
 class AllureListener(object):
     def __init__(self, lifecycle):
         self.lifecycle = lifecycle
-        self._platform = platform_label()
-        self._host = host_tag()
+        # robot results keep their label order: framework, language, host and then the pabot pool
+        self._session_labels = session_labels('robotframework', host=False, thread=False) + \
+            (Label(name=LabelType.HOST, value=host_tag()),)
         self._current_msg = None
         self._current_tb = None
 
@@ -144,9 +145,7 @@ class AllureListener(object):
             test_result.description = attributes.get('doc')
             test_result.status = get_allure_status(attributes.get('status'))
             test_result.labels.extend(get_allure_suites(attributes.get('longname')))
-            test_result.labels.append(Label(name=LabelType.FRAMEWORK, value='robotframework'))
-            test_result.labels.append(Label(name=LabelType.LANGUAGE, value=self._platform))
-            test_result.labels.append(Label(name=LabelType.HOST, value=self._host))
+            test_result.labels.extend(self._session_labels)
             test_result.labels.append(Label(name=LabelType.THREAD, value=pool_id()))
             test_result.labels.extend(allure_tags(attributes))
             tags = attributes.get('tags', ())
@@ -197,7 +196,7 @@ class AllureListener(object):
                 self.lifecycle.stop_step()
 
         if attachment:
-            self.lifecycle.attach_data(uuid=uuid4(), body=attachment, name='Keyword Log',
+            self.lifecycle.attach_data(uuid=fast_uuid(), body=attachment, name='Keyword Log',
                                        attachment_type=AttachmentType.HTML)
 
     @allure_commons.hookimpl
@@ -224,11 +223,11 @@ class AllureListener(object):
 
     @allure_commons.hookimpl
     def attach_data(self, body, name, attachment_type, extension):
-        self.lifecycle.attach_data(uuid4(), body, name=name, attachment_type=attachment_type, extension=extension)
+        self.lifecycle.attach_data(fast_uuid(), body, name=name, attachment_type=attachment_type, extension=extension)
 
     @allure_commons.hookimpl
     def attach_file(self, source, name, attachment_type, extension):
-        self.lifecycle.attach_file(uuid4(), source, name=name, attachment_type=attachment_type, extension=extension)
+        self.lifecycle.attach_file(fast_uuid(), source, name=name, attachment_type=attachment_type, extension=extension)
 
     @allure_commons.hookimpl
     def start_step(self, uuid, title, params):
@@ -1,5 +1,5 @@
 from robot.api import SuiteVisitor
-from allure_commons.utils import get_testplan
+from allure_commons.testplan import load_testplan
 from allure_robotframework.utils import allure_labels
 from allure_commons.types import LabelType
 
@@ -7,7 +7,7 @@ from allure_commons.types import LabelType
 # noinspection PyPep8Naming
 class allure_testplan(SuiteVisitor):
     def __init__(self):
-        self.testplan = get_testplan()
+        self.testplan = load_testplan()
 
     def start_suite(self, suite):
         if self.testplan:
@@ -21,7 +21,7 @@ class allure_testplan(SuiteVisitor):
             for label in allure_labels(test.tags):
                 if label.name == LabelType.ID:
                     allure_id = str(label.value)
-            if allure_id and any([allure_id == item.get("id", None) for item in self.testplan]):
+            if self.testplan.contains_id(allure_id):
                 included_tests.append(test.name)
 
-        return included_tests or [test["selector"] for test in self.testplan]
+        return included_tests
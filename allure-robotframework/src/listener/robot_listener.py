@@ -14,10 +14,10 @@ DEFAULT_OUTPUT_PATH = os.path.join('output', 'allure')
 class allure_robotframework(object):
     ROBOT_LISTENER_API_VERSION = 2
 
-    def __init__(self, logger_path=DEFAULT_OUTPUT_PATH):
+    def __init__(self, logger_path=DEFAULT_OUTPUT_PATH, json_backend=None):
         self.messages = Messages()
 
-        self.logger = AllureFileLogger(logger_path)
+        self.logger = AllureFileLogger(logger_path, json_backend=json_backend)
         self.lifecycle = AllureLifecycle()
         self.listener = AllureListener(self.lifecycle)
 
@@ -71,6 +71,7 @@ class allure_robotframework(object):
         for plugin in [self.logger, self.listener]:
             name = allure_commons.plugin_manager.get_name(plugin)
             allure_commons.plugin_manager.unregister(name=name)
+        self.logger.close()
 
 
 class Messages(object):